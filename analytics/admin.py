@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+from analytics.models import ProductCoPurchase, SellerProductDailySales
+
+admin.site.register(SellerProductDailySales)
+admin.site.register(ProductCoPurchase)
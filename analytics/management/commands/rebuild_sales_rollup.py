@@ -0,0 +1,22 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from analytics.rollup import rebuild_sales_rollup
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily seller sales rollup from the completed orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since", type=date.fromisoformat, help="First day, YYYY-MM-DD"
+        )
+        parser.add_argument(
+            "--until", type=date.fromisoformat, help="Last day, YYYY-MM-DD"
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_sales_rollup(options["since"], options["until"])
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily sales rows."))
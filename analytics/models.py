@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from products.models import Product
+
+User = get_user_model()
+
+
+class SellerProductDailySales(models.Model):
+    """
+    Units sold and revenue of a product per day, maintained as orders complete
+    """
+
+    seller = models.ForeignKey(
+        User, related_name="daily_sales", on_delete=models.CASCADE
+    )
+    product = models.ForeignKey(
+        Product, related_name="daily_sales", on_delete=models.CASCADE
+    )
+    day = models.DateField()
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    order_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Seller Product Daily Sales")
+        verbose_name_plural = _("Seller Product Daily Sales")
+        ordering = ("-day", "-id")
+        constraints = [
+            # Also serves the (seller, day range) lookups of the dashboard
+            models.UniqueConstraint(
+                fields=("seller", "day", "product"), name="unique_seller_day_product"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} on {self.day}"
+
+
+class ProductCoPurchase(models.Model):
+    """
+    Product frequently bought together with another one, ranked by the number
+    of completed orders containing both
+    """
+
+    product = models.ForeignKey(
+        Product, related_name="co_purchases", on_delete=models.CASCADE
+    )
+    recommended = models.ForeignKey(
+        Product, related_name="recommended_in", on_delete=models.CASCADE
+    )
+    score = models.PositiveIntegerField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        verbose_name = _("Product Co-purchase")
+        verbose_name_plural = _("Product Co-purchases")
+        ordering = ("product", "rank")
+        constraints = [
+            # Serves the lookup of the recommendations of a product in order
+            models.UniqueConstraint(
+                fields=("product", "rank"), name="unique_product_rank"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recommended_id} with {self.product_id}"
@@ -0,0 +1,115 @@
+import heapq
+from collections import defaultdict
+from itertools import combinations, groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from analytics.models import ProductCoPurchase
+from orders.models import Order, OrderItem
+from products.models import Product
+
+ORDER_CHUNK_SIZE = 2000
+
+
+def iter_order_baskets(chunk_size=ORDER_CHUNK_SIZE):
+    """
+    Yield the sorted product ids of every completed order, reading the orders
+    in keyset chunks
+    """
+    last_id = 0
+    while True:
+        order_ids = list(
+            Order.objects.filter(status=Order.COMPLETED, id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not order_ids:
+            return
+
+        items = (
+            OrderItem.objects.filter(order_id__in=order_ids)
+            .order_by("order_id")
+            .values_list("order_id", "product_id")
+        )
+        for _, rows in groupby(items, key=lambda row: row[0]):
+            yield sorted({product_id for _, product_id in rows})
+
+        last_id = order_ids[-1]
+
+
+def count_co_purchases(baskets, key_base):
+    """
+    Count the orders containing each pair of products.
+
+    A pair `a < b` is packed into the single int `a * key_base + b`, so the
+    counts fit in one flat dict instead of a dict per product.
+    """
+    counts = defaultdict(int)
+    for basket in baskets:
+        for a, b in combinations(basket, 2):
+            counts[a * key_base + b] += 1
+    return counts
+
+
+def get_top_co_purchases(counts, key_base, limit):
+    """
+    Keep the `limit` products most often bought with each product, as
+    `{product_id: [(score, other_id), ...]}` best first
+    """
+    heaps = defaultdict(list)
+    for key, score in counts.items():
+        a, b = divmod(key, key_base)
+        # Ties go to the lowest product id
+        for product_id, entry in ((a, (score, -b)), (b, (score, -a))):
+            heap = heaps[product_id]
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    return {
+        product_id: [(score, -other) for score, other in sorted(heap, reverse=True)]
+        for product_id, heap in heaps.items()
+    }
+
+
+def compute_recommendations(limit=None, chunk_size=ORDER_CHUNK_SIZE):
+    """
+    Recompute the frequently bought together products from the completed
+    orders and replace the stored ones. Returns the number of rows stored.
+    """
+    limit = limit or settings.RECOMMENDATIONS_PER_PRODUCT
+    key_base = (Product.objects.aggregate(max_id=Max("id"))["max_id"] or 0) + 1
+
+    counts = count_co_purchases(iter_order_baskets(chunk_size), key_base)
+    top = get_top_co_purchases(counts, key_base, limit)
+    del counts
+
+    rows = (
+        ProductCoPurchase(
+            product_id=product_id, recommended_id=other, score=score, rank=rank
+        )
+        for product_id, entries in top.items()
+        for rank, (score, other) in enumerate(entries, start=1)
+    )
+
+    with transaction.atomic():
+        ProductCoPurchase.objects.all().delete()
+        created = ProductCoPurchase.objects.bulk_create(rows, batch_size=1000)
+
+    return len(created)
+
+
+def get_recommended_products(product_id):
+    """
+    Products frequently bought together with a product, best first, with a
+    single indexed lookup
+    """
+    return (
+        Product.objects.filter(recommended_in__product_id=product_id)
+        .order_by("recommended_in__rank")
+        .select_related("seller", "category")
+        .defer("search_vector")
+    )
@@ -0,0 +1,114 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from analytics.models import SellerProductDailySales
+from orders.models import Order, OrderItem
+
+ROLLUP_BATCH_SIZE = 1000
+
+
+def get_sales(orders):
+    """
+    Sales of the given completed orders grouped by seller, product and day of
+    completion
+    """
+    return (
+        OrderItem.objects.filter(order__in=orders)
+        .order_by()
+        .values(
+            "product_id",
+            seller_id=F("product__seller_id"),
+            day=TruncDate("order__completed_at"),
+        )
+        .annotate(
+            units=Sum("quantity"),
+            revenue=Sum(
+                F("quantity") * F("unit_price"),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+            order_count=Count("order_id", distinct=True),
+        )
+    )
+
+
+def add_sales(row):
+    """
+    Add one grouped sales row to the rollup
+    """
+    lookup = {
+        "seller_id": row["seller_id"],
+        "product_id": row["product_id"],
+        "day": row["day"],
+    }
+    changes = {
+        "units": F("units") + row["units"],
+        "revenue": F("revenue") + row["revenue"],
+        "order_count": F("order_count") + row["order_count"],
+        "updated_at": timezone.now(),
+    }
+
+    if SellerProductDailySales.objects.filter(**lookup).update(**changes):
+        return
+
+    try:
+        with transaction.atomic():
+            SellerProductDailySales.objects.create(
+                **lookup,
+                units=row["units"],
+                revenue=row["revenue"],
+                order_count=row["order_count"],
+            )
+    except IntegrityError:
+        # Created by a concurrent order in the meantime
+        SellerProductDailySales.objects.filter(**lookup).update(**changes)
+
+
+@transaction.atomic
+def record_order_sales(order_id):
+    """
+    Add the sales of a just completed order to the rollup, only once. Returns
+    whether they were added.
+    """
+    recorded = Order.objects.filter(
+        id=order_id, status=Order.COMPLETED, sales_recorded=False
+    ).update(sales_recorded=True)
+    if not recorded:
+        return False
+
+    for row in get_sales(Order.objects.filter(id=order_id)):
+        add_sales(row)
+    return True
+
+
+@transaction.atomic
+def rebuild_sales_rollup(since=None, until=None):
+    """
+    Recompute the rollup from the completed orders, for every day or only the
+    days between `since` and `until`. Returns the number of rows written.
+    """
+    rollup = SellerProductDailySales.objects.all()
+    orders = Order.objects.filter(status=Order.COMPLETED, completed_at__isnull=False)
+    if since is not None:
+        rollup = rollup.filter(day__gte=since)
+        orders = orders.filter(completed_at__date__gte=since)
+    if until is not None:
+        rollup = rollup.filter(day__lte=until)
+        orders = orders.filter(completed_at__date__lte=until)
+
+    rollup.delete()
+    # Their sales are in the rebuilt rollup, they must not be recorded again
+    orders.filter(sales_recorded=False).update(sales_recorded=True)
+    sales = get_sales(orders)
+
+    written = 0
+    batch = []
+    for row in sales.iterator(chunk_size=ROLLUP_BATCH_SIZE):
+        batch.append(SellerProductDailySales(**row))
+        if len(batch) == ROLLUP_BATCH_SIZE:
+            written += len(SellerProductDailySales.objects.bulk_create(batch))
+            batch = []
+    written += len(SellerProductDailySales.objects.bulk_create(batch))
+
+    return written
@@ -0,0 +1,36 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from analytics.models import SellerProductDailySales
+
+
+class SellerProductDailySalesSerializer(serializers.ModelSerializer):
+    """
+    Serializer class for daily sales of a product
+    """
+
+    product_name = serializers.CharField(source="product.name", read_only=True)
+
+    class Meta:
+        model = SellerProductDailySales
+        fields = ("day", "product", "product_name", "units", "revenue", "order_count")
+
+
+class SalesFilterSerializer(serializers.Serializer):
+    """
+    Serializer class for validating sales analytics filters
+    """
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    product = serializers.IntegerField(required=False)
+
+    def validate(self, validated_data):
+        date_from = validated_data.get("date_from")
+        date_to = validated_data.get("date_to")
+
+        if date_from is not None and date_to is not None and date_from > date_to:
+            error = {"date_from": _("Start date is after the end date.")}
+            raise serializers.ValidationError(error)
+
+        return validated_data
@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from analytics.recommendations import compute_recommendations
+from products.cache import RECOMMENDATIONS, bump_version
+
+
+@shared_task()
+def compute_recommendations_task():
+    """
+    Celery task to recompute the frequently bought together products
+    """
+    stored = compute_recommendations()
+    bump_version(RECOMMENDATIONS)
+    return stored
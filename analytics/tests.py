@@ -0,0 +1,179 @@
+from datetime import date, datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from analytics.models import ProductCoPurchase, SellerProductDailySales
+from analytics.recommendations import (
+    compute_recommendations,
+    get_recommended_products,
+    get_top_co_purchases,
+)
+from analytics.rollup import rebuild_sales_rollup, record_order_sales
+from analytics.views import SellerSalesViewSet
+from core.testing import QueryBudgetTestCase
+from orders.models import Order, OrderItem
+from products.models import Product, ProductCategory
+
+User = get_user_model()
+
+
+class SalesQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = User.objects.create_user(username="seller", email="s@x.com")
+        category = ProductCategory.objects.create(name="Books")
+        products = [
+            Product.objects.create(
+                seller=cls.seller, category=category, name=f"Book {i}", price="5.00"
+            )
+            for i in range(3)
+        ]
+        SellerProductDailySales.objects.bulk_create(
+            SellerProductDailySales(
+                seller=cls.seller,
+                product=product,
+                day=date(2022, 1, day),
+                units=2,
+                revenue="10.00",
+                order_count=1,
+            )
+            for product in products
+            for day in (1, 2)
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.seller)
+
+    def test_sales_list(self):
+        self.assertQueryBudget(
+            SellerSalesViewSet,
+            "list",
+            reverse("analytics:sellerproductdailysales-list"),
+        )
+
+
+class SalesRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        sellers = [
+            User.objects.create_user(username=f"seller{i}", email=f"s{i}@x.com")
+            for i in range(2)
+        ]
+        category = ProductCategory.objects.create(name="Books")
+        products = [
+            Product.objects.create(
+                seller=sellers[i % 2],
+                category=category,
+                name=f"Book {i}",
+                price=f"{i + 1}.50",
+                quantity=100,
+            )
+            for i in range(3)
+        ]
+        cls.orders = []
+        for i, day in enumerate((1, 1, 2, 3, 3)):
+            order = Order.objects.create(buyer=buyer)
+            for product in products[: i % 3 + 1]:
+                OrderItem.objects.create(order=order, product=product, quantity=i + 1)
+            Order.objects.filter(id=order.id).update(
+                status=Order.COMPLETED,
+                completed_at=datetime(2022, 1, day, 12, tzinfo=timezone.utc),
+            )
+            cls.orders.append(order)
+
+    def get_rollup(self):
+        return list(
+            SellerProductDailySales.objects.order_by("day", "product_id").values_list(
+                "seller_id", "product_id", "day", "units", "revenue", "order_count"
+            )
+        )
+
+    def test_incremental_rollup_equals_rebuild(self):
+        for order in self.orders:
+            self.assertTrue(record_order_sales(order.id))
+        recorded = self.get_rollup()
+
+        self.assertEqual(rebuild_sales_rollup(), len(recorded))
+        self.assertEqual(self.get_rollup(), recorded)
+
+        rebuild_sales_rollup(since=date(2022, 1, 2), until=date(2022, 1, 2))
+        self.assertEqual(self.get_rollup(), recorded)
+
+    def test_record_order_sales_is_idempotent(self):
+        order = self.orders[2]
+        self.assertTrue(record_order_sales(order.id))
+        recorded = self.get_rollup()
+
+        self.assertFalse(record_order_sales(order.id))
+        self.assertEqual(self.get_rollup(), recorded)
+
+    def test_rebuilt_orders_are_not_recorded_again(self):
+        rebuild_sales_rollup()
+        rebuilt = self.get_rollup()
+
+        self.assertFalse(record_order_sales(self.orders[0].id))
+        self.assertEqual(self.get_rollup(), rebuilt)
+
+    def test_pending_order_is_not_recorded(self):
+        order = self.orders[0]
+        Order.objects.filter(id=order.id).update(status=Order.PENDING)
+
+        self.assertFalse(record_order_sales(order.id))
+        self.assertFalse(SellerProductDailySales.objects.exists())
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        seller = User.objects.create_user(username="seller", email="s@x.com")
+        category = ProductCategory.objects.create(name="Books")
+        cls.products = [
+            Product.objects.create(
+                seller=seller, category=category, name=f"Book {i}", price="5.00"
+            )
+            for i in range(5)
+        ]
+
+    def complete_order(self, *products):
+        order = Order.objects.create(buyer=self.buyer)
+        for product in products:
+            OrderItem.objects.create(order=order, product=product, quantity=1)
+        Order.objects.filter(id=order.id).update(status=Order.COMPLETED)
+
+    def get_recommended_ids(self, product):
+        return list(get_recommended_products(product.id).values_list("id", flat=True))
+
+    def test_top_co_purchases_break_ties_on_lowest_id(self):
+        key_base = 10
+        # Pairs of product 1, packed as `a * key_base + b`
+        counts = {17: 1, 15: 2, 13: 1, 12: 1}
+
+        top = get_top_co_purchases(counts, key_base, limit=3)
+
+        self.assertEqual(top[1], [(2, 5), (1, 2), (1, 3)])
+        self.assertEqual(top[7], [(1, 1)])
+
+    def test_recommendations_are_ranked_deterministically(self):
+        first, *others = self.products
+        # Bought once with every other product, twice with the last one
+        self.complete_order(*reversed(self.products))
+        self.complete_order(first, others[-1])
+
+        self.assertEqual(compute_recommendations(limit=3), 15)
+        self.assertEqual(
+            self.get_recommended_ids(first),
+            [others[-1].id, others[0].id, others[1].id],
+        )
+        self.assertEqual(
+            list(
+                ProductCoPurchase.objects.filter(product=first).values_list(
+                    "rank", "score"
+                )
+            ),
+            [(1, 2), (2, 1), (3, 1)],
+        )
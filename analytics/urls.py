@@ -0,0 +1,14 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from analytics.views import SellerSalesViewSet
+
+app_name = "analytics"
+
+router = DefaultRouter()
+router.register(r"sales", SellerSalesViewSet)
+
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
@@ -0,0 +1,58 @@
+from django.db.models import Sum
+from rest_framework import mixins, permissions, viewsets
+
+from analytics.models import SellerProductDailySales
+from analytics.serializers import (
+    SalesFilterSerializer,
+    SellerProductDailySalesSerializer,
+)
+from core.mixins import QueryBudgetMixin
+from core.pagination import DayCursorPagination
+
+
+class SellerSalesViewSet(
+    QueryBudgetMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    Daily units and revenue of the products of the current user
+
+    Filter with `date_from`, `date_to` and `product`. The list comes with the
+    units and revenue totals of the filtered days. Reads only from the daily rollup, never from
+    the orders.
+    """
+
+    queryset = SellerProductDailySales.objects.all()
+    serializer_class = SellerProductDailySalesSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = DayCursorPagination
+    query_budget = {"list": 2}
+
+    def get_queryset(self):
+        res = super().get_queryset()
+        return res.filter(seller=self.request.user).select_related("product")
+
+    def filter_queryset(self, queryset):
+        serializer = SalesFilterSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+
+        if filters.get("date_from") is not None:
+            queryset = queryset.filter(day__gte=filters["date_from"])
+        if filters.get("date_to") is not None:
+            queryset = queryset.filter(day__lte=filters["date_to"])
+        if filters.get("product") is not None:
+            queryset = queryset.filter(product_id=filters["product"])
+
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # Orders with several products are in several rows, so their count
+        # can't be summed from the rollup
+        response.data["totals"] = queryset.order_by().aggregate(
+            units=Sum("units"), revenue=Sum("revenue")
+        )
+
+        return response
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from celery.schedules import crontab
 from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,19 +42,19 @@ INSTALLED_APPS = [
     "corsheaders",
     "drf_spectacular",
     # Local apps
+    "core",
     "users",
     "products",
     "orders",
     "payment",
+    "analytics",
 ]
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.cache.UpdateCacheMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.cache.FetchFromCacheMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -144,7 +145,18 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "dj_rest_auth.jwt_auth.JWTCookieAuthentication",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.CreatedAtCursorPagination",
+    "PAGE_SIZE": 20,
 }
 
 SITE_ID = 1
@@ -197,6 +209,20 @@ PAYMENT_CANCEL_URL = config("PAYMENT_CANCEL_URL")
 # Celery
 CELERY_BROKER_URL = config("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = config("REDIS_BACKEND")
+CELERY_BEAT_SCHEDULE = {
+    "release-expired-stock-reservations": {
+        "task": "orders.tasks.release_expired_reservations_task",
+        "schedule": 60.0,
+    },
+    "reconcile-hot-stock": {
+        "task": "products.tasks.reconcile_hot_stock_task",
+        "schedule": 10.0,
+    },
+    "compute-recommendations": {
+        "task": "analytics.tasks.compute_recommendations_task",
+        "schedule": crontab(hour=3, minute=0),
+    },
+}
 
 
 # DRF Spectacular
@@ -214,6 +240,25 @@ CACHES = {
         "LOCATION": config("REDIS_BACKEND"),
     },
 }
-CACHE_MIDDLEWARE_ALIAS = "default"
-CACHE_MIDDLEWARE_SECONDS = 3600
-CACHE_MIDDLEWARE_KEY_PREFIX = ""
+
+# Catalog responses are cached under versioned keys that change on every
+# product or category write, so the timeout only bounds memory use.
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Product facets
+PRODUCT_FACETS_CACHE_TIMEOUT = 60 * 60 * 24
+PRODUCT_FACET_PRICE_BUCKET_SIZE = 50
+
+# Stock reservations, also used as the expiry of Stripe checkout sessions.
+# Stripe requires at least 30 minutes after the session is created, the extra
+# minute covers the time between the reservation and the Stripe call.
+STOCK_RESERVATION_TIMEOUT_MINUTES = 31
+
+# Hot stock: the stock of products flagged `is_hot` is kept in Redis counters
+# and reconciled back to the database periodically
+HOT_STOCK_ENABLED = config("HOT_STOCK_ENABLED", default=False, cast=bool)
+HOT_STOCK_REDIS_URL = config("HOT_STOCK_REDIS_URL", default=config("REDIS_BACKEND"))
+HOT_STOCK_RECONCILE_BATCH_SIZE = 500
+
+# Frequently bought together products kept per product
+RECOMMENDATIONS_PER_PRODUCT = 10
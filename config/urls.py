@@ -20,6 +20,7 @@ urlpatterns = [
     path("api/products/", include("products.urls", namespace="products")),
     path("api/user/orders/", include("orders.urls", namespace="orders")),
     path("api/user/payments/", include("payment.urls", namespace="payment")),
+    path("api/user/analytics/", include("analytics.urls", namespace="analytics")),
     path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
     path(
         "resend-email/", ResendEmailVerificationView.as_view(), name="rest_resend_email"
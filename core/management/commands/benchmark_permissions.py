@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+
+from orders.views import OrderItemViewSet, OrderViewSet
+from payment.views import CheckoutAPIView, PaymentViewSet
+
+CASES = (
+    (OrderItemViewSet, "get", "list"),
+    (OrderItemViewSet, "patch", "partial_update"),
+    (OrderViewSet, "get", "retrieve"),
+    (OrderViewSet, "delete", "destroy"),
+    (PaymentViewSet, "put", "update"),
+    (CheckoutAPIView, "patch", None),
+)
+
+
+def resolve_permissions(view_class, request, action, count):
+    """
+    Resolve the permissions of `count` requests like `APIView.initial` does,
+    returns the size of the last list
+    """
+    for _ in range(count):
+        view = view_class()
+        view.request = request
+        if action is not None:
+            view.action = action
+        permissions = view.get_permissions()
+    return len(permissions)
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that resolving the permissions of the order and payment views "
+        "costs the same after many requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=10000)
+        parser.add_argument("--batch", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        batch = options["batch"]
+        batches = max(options["requests"] // batch, 2)
+
+        for view_class, method, action in CASES:
+            request = getattr(factory, method)("/")
+            name = f"{view_class.__name__}.{action or method.upper()}"
+
+            first_count = resolve_permissions(view_class, request, action, 1)
+            timings = []
+            for _ in range(batches):
+                start = time.perf_counter()
+                count = resolve_permissions(view_class, request, action, batch)
+                timings.append((time.perf_counter() - start) / batch * 1e6)
+
+            if count != first_count:
+                raise CommandError(
+                    f"{name}: the permission list grew from {first_count} to "
+                    f"{count} after {batches * batch} requests."
+                )
+
+            self.stdout.write(
+                f"{name}: {count} permissions, first batch {timings[0]:.2f} us, "
+                f"last batch {timings[-1]:.2f} us per request"
+            )
@@ -0,0 +1,77 @@
+import io
+import timeit
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+
+
+def build_payload(rows):
+    """
+    Build a paginated product list shaped like the catalog responses.
+    """
+    now = timezone.now()
+    results = [
+        {
+            "id": i,
+            "category": {"id": i % 50, "name": f"Category {i % 50}"},
+            "seller": str(uuid.UUID(int=i)),
+            "name": f"Product {i}",
+            "desc": "Lorem ipsum dolor sit amet, consectetur adipiscing elit " * 4,
+            "image": f"/media/product_images/{i}.jpg",
+            "image_variants": {
+                "thumbnail": {"webp": f"/media/variants/{i}_150.webp"},
+                "large": {"jpeg": f"/media/variants/{i}_1200.jpg"},
+            },
+            "price": Decimal(i) / 100,
+            "quantity": i % 20,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+    return {"next": None, "previous": None, "results": results}
+
+
+class Command(BaseCommand):
+    help = "Compare the default and orjson JSON renderers and parsers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed.")
+
+        data = build_payload(options["rows"])
+        repeat = options["repeat"]
+
+        body = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != body:
+            raise CommandError("FastJSONRenderer output differs from JSONRenderer.")
+
+        cases = (
+            ("render", JSONRenderer().render, FastJSONRenderer().render, data),
+            (
+                "parse",
+                lambda body: JSONParser().parse(io.BytesIO(body)),
+                lambda body: FastJSONParser().parse(io.BytesIO(body)),
+                body,
+            ),
+        )
+        self.stdout.write(f"{options['rows']} rows, {len(body)} bytes, {repeat} runs")
+        for name, default, fast, arg in cases:
+            default_time = timeit.timeit(lambda: default(arg), number=repeat)
+            fast_time = timeit.timeit(lambda: fast(arg), number=repeat)
+            self.stdout.write(
+                f"{name}: default {default_time / repeat * 1000:.2f} ms, "
+                f"orjson {fast_time / repeat * 1000:.2f} ms "
+                f"({default_time / fast_time:.1f}x)"
+            )
@@ -0,0 +1,133 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+
+from orders.models import Order
+from orders.views import OrderItemViewSet, OrderViewSet
+from payment.views import PaymentViewSet
+from products.models import ProductCategory
+from products.views import ProductViewSet
+from users.views import AddressViewSet
+
+User = get_user_model()
+
+# Plan lines reading a whole table. SQLite reports index scans as
+# `SCAN table USING INDEX`, which are not flagged.
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"\bSCAN (\w+)\b(?! USING)"),
+}
+
+
+def get_endpoints(user):
+    """
+    List endpoints to explain, with the url kwargs and query parameters of a
+    typical request of `user`
+    """
+    order = Order.objects.filter(buyer=user).first()
+    category = ProductCategory.objects.first()
+
+    return (
+        ("orders", OrderViewSet, {}, {}),
+        (
+            "orders by status and date",
+            OrderViewSet,
+            {},
+            {"status": Order.COMPLETED, "created_after": "2020-01-01T00:00:00Z"},
+        ),
+        ("order items", OrderItemViewSet, {"order_id": order.id if order else 0}, {}),
+        ("payments", PaymentViewSet, {}, {}),
+        ("addresses", AddressViewSet, {}, {}),
+        ("products", ProductViewSet, {}, {}),
+        (
+            "products by category",
+            ProductViewSet,
+            {},
+            {"category": category.id if category else 0},
+        ),
+        ("products by seller", ProductViewSet, {}, {"seller": user.id}),
+    )
+
+
+def get_list_queryset(view_class, user, kwargs, params):
+    """
+    Main queryset of the list action, filtered and sliced to the first page
+    like the view does
+    """
+    view = view_class(action_map={"get": "list"}, format_kwarg=None)
+    view.args, view.kwargs = (), kwargs
+    view.request = view.initialize_request(APIRequestFactory().get("/", params))
+    view.request.user = user
+
+    queryset = view.filter_queryset(view.get_queryset())
+
+    paginator = view.paginator
+    if paginator is None:
+        return queryset
+    ordering = getattr(paginator, "ordering", None)
+    if isinstance(ordering, (list, tuple)):
+        queryset = queryset.order_by(*ordering)
+    return queryset[: paginator.get_page_size(view.request) + 1]
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the main queryset of the list endpoints and flag sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Email of the user to explain requests of.")
+        parser.add_argument(
+            "--keep-seqscan",
+            action="store_true",
+            help=(
+                "Let PostgreSQL pick sequential scans. By default they are "
+                "disabled, so that small tables still show whether an index "
+                "can serve the query."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"{connection.vendor} is not supported.")
+
+        user = self.get_user(options["user"])
+        flagged = []
+
+        for name, view_class, kwargs, params in get_endpoints(user):
+            queryset = get_list_queryset(view_class, user, kwargs, params)
+            with transaction.atomic():
+                if connection.vendor == "postgresql" and not options["keep_seqscan"]:
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL enable_seqscan = off")
+                plan = queryset.explain()
+
+            tables = sorted(set(pattern.findall(plan)))
+            if tables:
+                flagged.append(name)
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{name}: sequential scan on {', '.join(tables)}"
+                    )
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: OK"))
+            if options["verbosity"] > 1:
+                self.stdout.write(plan)
+
+        if flagged:
+            raise CommandError(f"Sequential scans in: {', '.join(flagged)}.")
+
+    def get_user(self, email):
+        if email:
+            user = User.objects.filter(email=email).first()
+        else:
+            # The latest buyer, so the order endpoints filter on existing rows
+            order = Order.objects.select_related("buyer").first()
+            user = order.buyer if order else User.objects.order_by("pk").first()
+
+        if user is None:
+            raise CommandError("No user found to explain requests of.")
+        return user
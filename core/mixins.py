@@ -0,0 +1,110 @@
+from django.db.models import Prefetch
+from django.db.models.constants import LOOKUP_SEP
+
+
+class QueryBudgetMixin:
+    """
+    Declare the number of queries each action may run in `query_budget`.
+
+    Budgets are constant, so a serializer change that adds a query per row
+    breaks them as soon as a page holds a few rows. They are checked by the
+    tests of each app with `QueryBudgetTestCase`, never on live requests.
+    """
+
+    query_budget = {}
+
+
+class ActionPermissionMixin:
+    """
+    Check `permission_classes` plus the extra permissions declared for the
+    current action in `action_permission_classes`.
+
+    Keys are viewset actions, or HTTP methods for plain views, alone or in
+    tuples. The permission list of every action is built once per class and
+    never mutated, so it can't grow from one request to the next.
+    """
+
+    action_permission_classes = {}
+
+    @classmethod
+    def get_action_permission_classes(cls, action):
+        if "_action_permissions" not in cls.__dict__:
+            base = tuple(cls.permission_classes)
+            action_permissions = {}
+            for actions, extra in cls.action_permission_classes.items():
+                if isinstance(actions, str):
+                    actions = (actions,)
+                for name in actions:
+                    action_permissions[name] = base + tuple(extra)
+            cls._action_permissions = (base, action_permissions)
+
+        base, action_permissions = cls.__dict__["_action_permissions"]
+        return action_permissions.get(action, base)
+
+    def get_permission_action(self):
+        return getattr(self, "action", None) or self.request.method
+
+    def get_permissions(self):
+        permission_classes = self.get_action_permission_classes(
+            self.get_permission_action()
+        )
+        return [permission() for permission in permission_classes]
+
+
+class SparseFieldsetViewMixin:
+    """
+    Load only the columns and relations needed by the fields requested with
+    `?fields=` and `?expand=` on list and retrieve.
+
+    The serializer has to use `SparseFieldsetMixin`.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in ("list", "retrieve"):
+            return queryset
+
+        serializer = self.get_serializer()
+        if not serializer.is_sparse():
+            return queryset
+
+        dependencies = serializer.get_model_dependencies(queryset.model)
+        if dependencies is None:
+            return queryset
+
+        only, related, prefetched = dependencies
+        only.update(self.get_ordering_fields(queryset))
+
+        prefetches = [
+            lookup
+            for lookup in queryset._prefetch_related_lookups
+            if self.get_prefetch_root(lookup) in prefetched
+        ]
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if related:
+            # Without arguments select_related() would follow every relation
+            queryset = queryset.select_related(*related)
+
+        return queryset.prefetch_related(*prefetches).only(*only)
+
+    def get_ordering_fields(self, queryset):
+        """
+        Model fields the queryset and the paginator sort on
+        """
+        ordering = (
+            *queryset.query.order_by,
+            *queryset.model._meta.ordering,
+            *getattr(self.paginator, "ordering", ()),
+        )
+        names = {field.name for field in queryset.model._meta.concrete_fields}
+        return {
+            field.lstrip("-")
+            for field in ordering
+            if isinstance(field, str) and field.lstrip("-") in names
+        }
+
+    def get_prefetch_root(self, lookup):
+        if isinstance(lookup, Prefetch):
+            lookup = lookup.prefetch_to
+        return lookup.split(LOOKUP_SEP)[0]
@@ -0,0 +1,23 @@
+class MaintainedFieldsMixin:
+    """
+    Leave the fields in `maintained_fields` out of the saves of existing rows.
+
+    Those fields are kept up to date by `UPDATE`s computed in the database, an
+    instance only holds possibly stale values of them which must never be
+    written back. Fields that were not loaded are left alone too, as Django
+    does without `update_fields`.
+    """
+
+    maintained_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.maintained_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
@@ -0,0 +1,28 @@
+from django.contrib.postgres.operations import AddIndexConcurrently as BaseAddIndex
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrently(BaseAddIndex):
+    """
+    Create an index with `CREATE INDEX CONCURRENTLY` on PostgreSQL, without
+    locking writes to the table.
+
+    Other databases get a plain `CREATE INDEX`, so the migrations stay runnable
+    on SQLite. The migration has to set `atomic = False`.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
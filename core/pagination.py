@@ -0,0 +1,144 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination seeking on every field of `ordering`.
+
+    DRF's cursor only holds the first ordering field and steps over the rows
+    sharing its value with an offset. Here the cursor holds the values of
+    all the fields, which have to be unique together, and the next page is
+    read with a `WHERE` on them, so a deep page is an index range scan just
+    like the first one.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [self.reverse_field(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor and self.cursor.position is not None:
+            values = self.load_position(self.cursor.position, queryset.model)
+            queryset = queryset.filter(self.get_seek_filter(ordering, values))
+
+        results = list(queryset[: self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_following
+        else:
+            self.has_next, self.has_previous = has_following, self.cursor is not None
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self.dump_position(self.page[-1])
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self.dump_position(self.page[0])
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def reverse_field(self, field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def get_seek_filter(self, ordering, values):
+        """
+        Rows after `values` in `ordering`, e.g. for `("-created_at", "-id")`
+        `created_at < a OR (created_at = a AND id < b)`.
+
+        The redundant bound on the first field lets the database seek the
+        index on it.
+        """
+        names = [field.lstrip("-") for field in ordering]
+        lookups = ["lt" if field.startswith("-") else "gt" for field in ordering]
+
+        after = Q()
+        for i, (name, lookup) in enumerate(zip(names, lookups)):
+            equal = dict(zip(names[:i], values[:i]))
+            after |= Q(**equal, **{f"{name}__{lookup}": values[i]})
+
+        return Q(**{f"{names[0]}__{lookups[0]}e": values[0]}) & after
+
+    def dump_position(self, instance):
+        return json.dumps(
+            [str(getattr(instance, field.lstrip("-"))) for field in self.ordering]
+        )
+
+    def load_position(self, position, model):
+        """
+        Values of the ordering fields in `position`, converted by the fields so
+        a tampered cursor is rejected instead of failing in the query
+        """
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            values = [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if None in values:
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+
+class CreatedAtCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination on the newest first ordering of the list endpoints.
+
+    `id` breaks ties between rows created at the same instant and matches the
+    `(created_at, id)` index of every paginated model, so a deep page is an
+    index range scan just like the first one.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class RankedPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination for relevance ordered results, where there is no
+    stable column for a cursor to seek on.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class DayCursorPagination(CreatedAtCursorPagination):
+    """
+    Keyset pagination on the newest first ordering of daily rollups.
+    """
+
+    ordering = ("-day", "-id")
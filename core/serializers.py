@@ -0,0 +1,148 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import RelatedField
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for `?fields=` and `?expand=` query parameters.
+
+    `?fields=id,name` limits the output to the listed fields, and `?expand=`
+    replaces the fields listed in `Meta.expandable_fields` with the nested
+    serializer declared there. Both only apply to reads with the top level
+    serializer, never to nested ones nor to writes, which must see every
+    writable field of the request body.
+
+    `Meta.field_dependencies` lists the model fields and relations read by
+    fields which have no model source, like `SerializerMethodField`, so views
+    can load only the columns the response needs.
+    """
+
+    def is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_query_param(self, name):
+        request = self.context.get("request")
+        if (
+            request is None
+            or request.method not in SAFE_METHODS
+            or not self.is_top_level()
+        ):
+            return None
+        value = request.query_params.get(name)
+        return parse_field_list(value) if value else None
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        expand = self.get_query_param("expand") or set()
+        expandable_fields = getattr(self.Meta, "expandable_fields", {})
+        for name in expand.intersection(expandable_fields):
+            serializer_class, kwargs = expandable_fields[name]
+            fields[name] = serializer_class(read_only=True, **kwargs)
+
+        requested = self.get_query_param("fields")
+        if requested:
+            fields = {
+                name: field for name, field in fields.items() if name in requested
+            }
+
+        return fields
+
+    def is_sparse(self):
+        return bool(self.get_query_param("fields") or self.get_query_param("expand"))
+
+    def get_model_dependencies(self, model):
+        """
+        Return the `only()` and `select_related()` paths and the prefetched
+        relations needed to represent instances of `model`, or None if they
+        can't be worked out
+        """
+        only = {model._meta.pk.name}
+        related = set()
+        prefetched = set()
+        dependencies = getattr(self.Meta, "field_dependencies", {})
+
+        for name, field in self.fields.items():
+            if name in dependencies:
+                for lookup in dependencies[name]:
+                    root = model._meta.get_field(lookup.split("__")[0])
+                    if root.one_to_many or root.many_to_many:
+                        prefetched.add(root.name)
+                    else:
+                        only.add(lookup)
+                continue
+            if field.source == "*":
+                return None
+
+            current = model
+            path = []
+            for attr in field.source_attrs:
+                try:
+                    model_field = current._meta.get_field(attr)
+                except FieldDoesNotExist:
+                    # Method or property of the current model, load it fully
+                    if not path:
+                        return None
+                    only.add("__".join(path))
+                    break
+
+                path.append(attr)
+                lookup = "__".join(path)
+
+                if not model_field.is_relation:
+                    only.add(lookup)
+                    break
+
+                if model_field.many_to_many or model_field.one_to_many:
+                    # Prefetched separately, nothing to load here
+                    prefetched.add(path[0])
+                    break
+
+                if not model_field.concrete:
+                    # Reverse one-to-one, joined without touching our columns
+                    related.add(lookup)
+                    break
+
+                is_last = len(path) == len(field.source_attrs)
+                if is_last and isinstance(field, RelatedField):
+                    # Primary key representation only needs the foreign key
+                    only.add(lookup)
+                    break
+
+                related.add(lookup)
+                if is_last:
+                    only.add(lookup)
+                current = model_field.related_model
+
+        return only, related, prefetched
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves objects from the `instance_cache` of its
+    serializer, e.g. filled in bulk by a list serializer, and only queries
+    when there is no cache
+    """
+
+    def to_internal_value(self, data):
+        cache = getattr(self.parent, "instance_cache", {}).get(self.field_name)
+        if cache is None:
+            return super().to_internal_value(data)
+
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            return cache[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class QueryBudgetTestCase(APITestCase):
+    """
+    Check the `query_budget` of views against pages of several rows, so a
+    query added per row goes over the budget. Seed more rows than the budget.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Responses cached by a previous test would skip the queries
+        cache.clear()
+
+    def assertQueryBudget(self, view_class, action, url, data=None, min_rows=2):
+        budget = view_class.query_budget[action]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+
+        self.assertEqual(response.status_code, 200, response.data)
+        results = response.data
+        if isinstance(results, dict):
+            results = results.get("results")
+        if isinstance(results, list):
+            self.assertGreaterEqual(len(results), min_rows)
+
+        sql = "\n".join(query["sql"] for query in queries.captured_queries)
+        self.assertLessEqual(
+            len(queries),
+            budget,
+            f"{view_class.__name__}.{action} ran {len(queries)} queries, "
+            f"the budget is {budget}:\n{sql}",
+        )
+        return response
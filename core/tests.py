@@ -0,0 +1,99 @@
+import json
+import math
+from base64 import b64encode
+from datetime import timedelta
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from core.renderers import FastJSONRenderer
+from users.models import Address
+
+User = get_user_model()
+
+
+def forge_cursor(position):
+    query = urlencode({"o": 0, "p": position})
+    return b64encode(query.encode()).decode()
+
+
+class KeysetCursorPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", email="u@x.com")
+        cls.addresses = [
+            Address.objects.create(
+                user=cls.user,
+                address_type=Address.SHIPPING,
+                country="US",
+                city="City",
+                street_address=f"Street {i}",
+                apartment_address="1",
+            )
+            for i in range(5)
+        ]
+        # Rows sharing a timestamp are told apart by their id
+        created_at = timezone.now() - timedelta(days=1)
+        Address.objects.filter(id__in=[a.id for a in cls.addresses[1:4]]).update(
+            created_at=created_at
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.url = reverse("users:address-list")
+
+    def test_pages_forward_and_back(self):
+        response = self.client.get(self.url, {"page_size": 2})
+        pages = [response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            pages.append(response.data["results"])
+
+        ids = [row["id"] for page in pages for row in page]
+        expected = Address.objects.order_by("-created_at", "-id")
+        self.assertEqual(ids, list(expected.values_list("id", flat=True)))
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(response.data["results"], pages[-2])
+
+    def test_forged_cursor_is_not_found(self):
+        for position in (
+            '["notadate", "1"]',
+            "[null, null]",
+            '[{"a": 1}, [1]]',
+            '["2022-01-01 00:00:00+00:00", "x"]',
+            '["2022-01-01 00:00:00+00:00"]',
+            "notjson",
+        ):
+            with self.subTest(position=position):
+                response = self.client.get(self.url, {"cursor": forge_cursor(position)})
+                self.assertEqual(response.status_code, 404)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_matches_default_renderer(self):
+        data = {
+            "price": Decimal("9.99"),
+            "created_at": timezone.now(),
+            "name": "caf\u00e9\u2028",
+            "items": [1, None, True, {"nested": [1.5]}],
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_floats_decode_to_the_same_value(self):
+        data = [1e20, 0.1, -1e-7]
+
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), data)
+
+    def test_non_finite_floats_fall_back_to_default_renderer(self):
+        for value in (math.nan, math.inf, -math.inf):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render({"results": [{"score": value}]})
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from orders.models import Order, OrderItem
+from orders.models import Order, OrderItem, StockReservation
 
 admin.site.register(Order)
 admin.site.register(OrderItem)
+admin.site.register(StockReservation)
@@ -0,0 +1,28 @@
+from rest_framework.filters import BaseFilterBackend
+
+from orders.serializers import OrderFilterSerializer
+
+
+def filter_orders(queryset, filters):
+    if filters.get("status"):
+        queryset = queryset.filter(status=filters["status"])
+    if filters.get("created_after") is not None:
+        queryset = queryset.filter(created_at__gte=filters["created_after"])
+    if filters.get("created_before") is not None:
+        queryset = queryset.filter(created_at__lt=filters["created_before"])
+
+    return queryset
+
+
+class OrderFilter(BaseFilterBackend):
+    """
+    Filter orders by status and creation date range
+    """
+
+    def get_filters(self, request):
+        serializer = OrderFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_orders(queryset, self.get_filters(request))
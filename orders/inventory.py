@@ -0,0 +1,215 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from orders.models import OrderItem, StockReservation
+from products import stock
+from products.cache import CATEGORIES, PRODUCTS, bump_version
+from products.counters import apply_count_deltas, get_count_deltas, get_stock_changes
+from products.models import Product
+
+
+class InsufficientStock(Exception):
+    """
+    Raised when the stock of some products can't cover an order
+    """
+
+    def __init__(self, product_ids):
+        self.product_ids = product_ids
+        super().__init__(f"Not enough stock for products {product_ids}")
+
+
+def get_order_quantities(order_id):
+    """
+    Ordered quantity of each product of an order, by product id so rows are
+    always locked in the same order
+    """
+    quantities = defaultdict(int)
+    items = OrderItem.objects.filter(order_id=order_id).values_list(
+        "product_id", "quantity"
+    )
+    for product_id, quantity in items:
+        quantities[product_id] += quantity
+    return dict(sorted(quantities.items()))
+
+
+def get_available_quantity(product):
+    """
+    Stock of a product that is not held by a pending checkout
+    """
+    if stock.is_enabled() and product.is_hot:
+        return stock.get_available_quantities([product.id])[product.id]
+    return product.available_quantity
+
+
+def release_reservations(reservations):
+    """
+    Give the stock held by the given reservations back and delete them
+    """
+    totals = (
+        reservations.order_by("product_id")
+        .values_list("product_id", "is_hot")
+        .annotate(total=Sum("quantity"))
+    )
+    hot = {}
+    for product_id, is_hot, total in totals:
+        if is_hot:
+            hot[product_id] = total
+        else:
+            Product.objects.filter(pk=product_id).update(
+                reserved_quantity=F("reserved_quantity") - total
+            )
+    if hot:
+        # Seeded while the reservations still exist, so the counters hold
+        # their stock until it is given back
+        stock.seed_counters(hot)
+    reservations.delete()
+    # Only once the deletion is committed, a rollback keeps the stock held
+    if hot:
+        transaction.on_commit(lambda: stock.release(hot))
+
+
+@transaction.atomic
+def reserve_order_stock(order):
+    """
+    Hold the stock of every item of an order until the reservation expires.
+
+    Each product is reserved with a single conditional `UPDATE`, so concurrent
+    checkouts can never hold more than the stock. Hot products are reserved
+    from their Redis counters instead, without touching their rows.
+    Reservations left over from a previous checkout of the order are released
+    first. Raises `InsufficientStock` without reserving anything if a product
+    falls short.
+    """
+    quantities = get_order_quantities(order.id)
+    hot_ids = stock.get_hot_product_ids(quantities)
+
+    previous = StockReservation.objects.filter(order=order)
+    released = dict(previous.filter(is_hot=True).values_list("product_id", "quantity"))
+    # Seeding subtracts the hot reservations, so it must see the previous ones
+    # and not the new ones
+    if hot_ids:
+        stock.seed_counters(hot_ids)
+    release_reservations(previous.filter(is_hot=False))
+    previous.delete()
+
+    missing = [
+        product_id
+        for product_id, quantity in quantities.items()
+        if product_id not in hot_ids
+        and not Product.objects.filter(
+            pk=product_id,
+            quantity__gte=F("reserved_quantity") + quantity,
+        ).update(reserved_quantity=F("reserved_quantity") + quantity)
+    ]
+    if missing:
+        raise InsufficientStock(missing)
+
+    expires_at = timezone.now() + timedelta(
+        minutes=settings.STOCK_RESERVATION_TIMEOUT_MINUTES
+    )
+    StockReservation.objects.bulk_create(
+        StockReservation(
+            order=order,
+            product_id=product_id,
+            quantity=quantity,
+            expires_at=expires_at,
+            is_hot=product_id in hot_ids,
+        )
+        for product_id, quantity in quantities.items()
+    )
+
+    # Last, so a failure rolls the database reservations back. The previous
+    # hot reservations are given back by the same script.
+    if hot_ids or released:
+        missing = stock.reserve(
+            {pk: quantity for pk, quantity in quantities.items() if pk in hot_ids},
+            released,
+        )
+        if missing:
+            raise InsufficientStock(missing)
+
+    return expires_at
+
+
+def commit_order_stock(order_id):
+    """
+    Take the stock of a paid order out of the inventory.
+
+    The reservations of the order are released and each product is then
+    decremented with a single conditional `UPDATE`, in the same transaction so
+    the released stock can't be taken by another checkout in between. Orders
+    whose reservation already expired are still fulfilled if enough stock is
+    left. Hot products are sold from their Redis counters the same way, last,
+    so the callers must not write anything after it in their transaction.
+    Returns the ids of the products that could not be fulfilled.
+    """
+    with transaction.atomic():
+        reservations = StockReservation.objects.filter(order_id=order_id)
+        quantities = get_order_quantities(order_id)
+
+        hot_reserved = dict(
+            reservations.filter(is_hot=True).values_list("product_id", "quantity")
+        )
+        hot_ids = stock.get_hot_product_ids(quantities) | hot_reserved.keys()
+        # Seeding subtracts the hot reservations, so it must see them
+        if hot_ids:
+            stock.seed_counters(hot_ids)
+
+        release_reservations(reservations.filter(is_hot=False))
+        reservations.delete()
+
+        missing = []
+        sold = {}
+        for product_id, quantity in quantities.items():
+            if product_id in hot_ids:
+                continue
+            if Product.objects.filter(
+                pk=product_id,
+                quantity__gte=F("reserved_quantity") + quantity,
+            ).update(quantity=F("quantity") - quantity):
+                sold[product_id] = quantity
+            else:
+                missing.append(product_id)
+
+        # The rows are locked by the updates, so the products that ran out
+        # of stock are counted by this transaction only
+        sold_out = Product.objects.filter(pk__in=sold, quantity__lte=0).values_list(
+            "id", "category_id", "quantity"
+        )
+        apply_count_deltas(
+            get_count_deltas(
+                get_stock_changes(
+                    (category_id, quantity + sold[pk], quantity)
+                    for pk, category_id, quantity in sold_out
+                )
+            )
+        )
+
+        # Last, so a failure rolls the database changes back
+        if hot_ids:
+            missing += stock.commit(
+                hot_reserved,
+                {pk: quantity for pk, quantity in quantities.items() if pk in hot_ids},
+            )
+
+    bump_version(PRODUCTS, CATEGORIES)
+    return missing
+
+
+def release_expired_reservations():
+    """
+    Release every reservation past its expiry, returns how many were released
+    """
+    with transaction.atomic():
+        expired = list(
+            StockReservation.objects.select_for_update(skip_locked=True)
+            .filter(expires_at__lte=timezone.now())
+            .values_list("id", flat=True)
+        )
+        release_reservations(StockReservation.objects.filter(id__in=expired))
+    return len(expired)
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = "Detect orders whose stored totals drifted from their items."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix", action="store_true", help="Recompute the drifted totals"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        drifted = 0
+        last_id = 0
+
+        while True:
+            ids = list(
+                Order.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            drifted_ids = list(
+                Order.objects.filter(id__in=ids)
+                .with_computed_totals()
+                .filter(
+                    ~Q(total_cost=F("computed_total_cost"))
+                    | ~Q(item_count=F("computed_item_count"))
+                )
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+            if not drifted_ids:
+                continue
+
+            drifted += len(drifted_ids)
+            self.stdout.write(f"Drifted orders: {', '.join(map(str, drifted_ids))}")
+            if options["fix"]:
+                Order.objects.filter(id__in=drifted_ids).refresh_totals()
+
+        if options["fix"]:
+            message = f"Fixed the totals of {drifted} orders."
+        else:
+            message = f"Found {drifted} orders with drifted totals."
+        self.stdout.write(self.style.SUCCESS(message))
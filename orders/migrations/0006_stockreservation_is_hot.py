@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_stock_reservation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockreservation',
+            name='is_hot',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:17
+
+from django.db import migrations, transaction
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 1000
+
+
+def backfill_price_snapshot(apps, schema_editor):
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    Product = apps.get_model('products', 'Product')
+
+    product = Product.objects.filter(pk=OuterRef('product_id'))
+    pending = OrderItem.objects.filter(unit_price__isnull=True).order_by('pk')
+
+    # One short transaction per batch of primary keys, so the table is never
+    # locked for the whole backfill
+    last_pk = 0
+    while True:
+        pks = list(
+            pending.filter(pk__gt=last_pk).values_list('pk', flat=True)[:BATCH_SIZE]
+        )
+        if not pks:
+            break
+        with transaction.atomic():
+            OrderItem.objects.filter(pk__in=pks).update(
+                unit_price=Subquery(product.values('price')[:1]),
+                product_name=Subquery(product.values('name')[:1]),
+            )
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0007_orderitem_price_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_price_snapshot, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:18
+
+from decimal import Decimal
+
+from django.db import migrations, models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def compute_order_totals(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    OrderItem = apps.get_model('orders', 'OrderItem')
+
+    cost_field = models.DecimalField(max_digits=12, decimal_places=2)
+    items = OrderItem.objects.filter(order=OuterRef('pk')).order_by().values('order')
+    total_cost = items.annotate(
+        total=Sum(F('quantity') * F('unit_price'), output_field=cost_field)
+    ).values('total')
+    item_count = items.annotate(total=Sum('quantity')).values('total')
+
+    # One short transaction per batch of primary keys, so the table is never
+    # locked for the whole backfill
+    last_pk = 0
+    while True:
+        pks = list(
+            Order.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:BATCH_SIZE]
+        )
+        if not pks:
+            break
+        with transaction.atomic():
+            Order.objects.filter(pk__in=pks).update(
+                total_cost=Coalesce(
+                    Subquery(total_cost, output_field=cost_field),
+                    Value(Decimal('0.00')),
+                    output_field=cost_field,
+                ),
+                item_count=Coalesce(
+                    Subquery(item_count, output_field=models.IntegerField()),
+                    Value(0),
+                ),
+            )
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0009_orderitem_price_snapshot_not_null'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_cost',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.RunPython(compute_order_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:20
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def merge_duplicate_items(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    OrderItem = apps.get_model('orders', 'OrderItem')
+
+    duplicates = (
+        OrderItem.objects.order_by()
+        .values('order_id', 'product_id')
+        .annotate(keep_id=Min('id'), quantity=Sum('quantity'), items=Count('id'))
+        .filter(items__gt=1)
+    )
+    order_ids = set()
+    for row in duplicates:
+        items = OrderItem.objects.filter(
+            order_id=row['order_id'], product_id=row['product_id']
+        )
+        items.exclude(id=row['keep_id']).delete()
+        items.update(quantity=row['quantity'])
+        order_ids.add(row['order_id'])
+
+    # The merged items keep the price snapshot of the oldest one
+    cost_field = models.DecimalField(max_digits=12, decimal_places=2)
+    total_cost = (
+        OrderItem.objects.filter(order=OuterRef('pk'))
+        .order_by()
+        .values('order')
+        .annotate(total=Sum(F('quantity') * F('unit_price'), output_field=cost_field))
+        .values('total')
+    )
+    Order.objects.filter(id__in=order_ids).update(
+        total_cost=Coalesce(
+            Subquery(total_cost, output_field=cost_field),
+            Value(Decimal('0.00')),
+            output_field=cost_field,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_order_totals'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='orderitem',
+            constraint=models.UniqueConstraint(fields=('order', 'product'), name='unique_order_product'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0011_orderitem_unique_order_product'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['buyer', '-created_at', '-id'], name='order_buyer_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='orderitem',
+            index=models.Index(fields=['order', '-created_at', '-id'], name='orderitem_order_created_idx'),
+        ),
+    ]
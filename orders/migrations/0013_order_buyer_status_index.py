@@ -0,0 +1,21 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0012_composite_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['buyer', 'status', '-created_at', '-id'], name='order_buyer_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:39
+
+from django.db import migrations, models, transaction
+from django.db.models import F
+
+BATCH_SIZE = 1000
+
+
+def backfill_completed_at(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+
+    # The last update of a completed order is the best known completion time.
+    # One short transaction per batch of primary keys, so the table is never
+    # locked for the whole backfill
+    completed = Order.objects.filter(status='C', completed_at__isnull=True)
+    last_pk = 0
+    while True:
+        pks = list(
+            completed.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:BATCH_SIZE]
+        )
+        if not pks:
+            break
+        with transaction.atomic():
+            Order.objects.filter(pk__in=pks).update(completed_at=F('updated_at'))
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0013_order_buyer_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.0.4 on 2026-10-18 20:12
+
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+
+
+def mark_sales_recorded(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+
+    # The sales of the orders completed so far are already in the rollup. One
+    # short transaction per batch of primary keys, so the table is never locked
+    # for the whole backfill
+    completed = Order.objects.filter(status='C', sales_recorded=False)
+    last_pk = 0
+    while True:
+        pks = list(
+            completed.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:BATCH_SIZE]
+        )
+        if not pks:
+            break
+        with transaction.atomic():
+            Order.objects.filter(pk__in=pks).update(sales_recorded=True)
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0014_order_completed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='sales_recorded',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(mark_sales_recorded, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.shortcuts import get_object_or_404
+
+from orders.models import Order
+
+
+class ParentOrderMixin:
+    """
+    Resolve the order of the `order_id` URL kwarg once per request.
+
+    Permissions and the view share the instance through `get_parent_order()`,
+    views load the related rows they need by overriding
+    `get_parent_order_queryset()`.
+    """
+
+    parent_order_kwarg = "order_id"
+
+    def get_parent_order_queryset(self):
+        return Order.objects.all()
+
+    def get_parent_order(self):
+        if not hasattr(self, "_parent_order"):
+            self._parent_order = get_object_or_404(
+                self.get_parent_order_queryset(),
+                id=self.kwargs.get(self.parent_order_kwarg),
+            )
+        return self._parent_order
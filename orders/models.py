@@ -1,15 +1,89 @@
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import (
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
+from core.models import MaintainedFieldsMixin
 from products.models import Product
 from users.models import Address
 
 User = get_user_model()
 
+COST_FIELD = DecimalField(max_digits=12, decimal_places=2)
+
+
+def get_item_totals():
+    """
+    Total cost and item count of the order in `OuterRef("pk")`, computed from
+    its items
+    """
+    items = OrderItem.objects.filter(order=OuterRef("pk")).order_by().values("order")
+    total_cost = items.annotate(
+        total=Sum(F("quantity") * F("unit_price"), output_field=COST_FIELD)
+    ).values("total")
+    item_count = items.annotate(total=Sum("quantity")).values("total")
+
+    return {
+        "total_cost": Coalesce(
+            Subquery(total_cost, output_field=COST_FIELD),
+            Value(Decimal("0.00")),
+            output_field=COST_FIELD,
+        ),
+        "item_count": Coalesce(
+            Subquery(item_count, output_field=models.IntegerField()), Value(0)
+        ),
+    }
+
+
+class OrderQuerySet(models.QuerySet):
+    def refresh_totals(self):
+        """
+        Recompute the stored totals of the orders with a single `UPDATE`
+        """
+        return self.update(**get_item_totals())
+
+    def with_computed_totals(self):
+        """
+        Annotate `computed_total_cost` and `computed_item_count` from the items
+        """
+        return self.annotate(
+            **{f"computed_{name}": value for name, value in get_item_totals().items()}
+        )
+
+    def with_items(self):
+        """
+        Prefetch the items with their cost
+        """
+        items = OrderItem.objects.with_cost()
+        return self.prefetch_related(Prefetch("order_items", queryset=items))
+
 
-class Order(models.Model):
+class OrderItemQuerySet(models.QuerySet):
+    def with_cost(self):
+        """
+        Annotate `cost` computed by the database
+        """
+        return self.annotate(
+            cost=ExpressionWrapper(
+                F("quantity") * F("unit_price"), output_field=COST_FIELD
+            )
+        )
+
+
+class Order(MaintainedFieldsMixin, models.Model):
     PENDING = "P"
     COMPLETED = "C"
 
@@ -31,23 +105,38 @@ class Order(models.Model):
         blank=True,
         null=True,
     )
+    # Maintained from the items with `refresh_totals()`
+    total_cost = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, editable=False
+    )
+    item_count = models.PositiveIntegerField(default=0, editable=False)
+    # Set when the payment completes the order, sales are reported on its day
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Set once the sales of the completed order are added to the rollup
+    sales_recorded = models.BooleanField(default=False, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+    maintained_fields = ("total_cost", "item_count", "sales_recorded")
+
     class Meta:
-        ordering = ("-created_at",)
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(fields=("-created_at", "-id"), name="order_created_id_idx"),
+            models.Index(
+                fields=("buyer", "-created_at", "-id"), name="order_buyer_created_idx"
+            ),
+            models.Index(
+                fields=("buyer", "status", "-created_at", "-id"),
+                name="order_buyer_status_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.buyer.get_full_name()
 
-    @cached_property
-    def total_cost(self):
-        """
-        Total cost of all the items in an order
-        """
-        return round(sum([order_item.cost for order_item in self.order_items.all()]), 2)
-
 
 class OrderItem(models.Model):
     order = models.ForeignKey(
@@ -57,19 +146,81 @@ class OrderItem(models.Model):
         Product, related_name="product_orders", on_delete=models.CASCADE
     )
     quantity = models.IntegerField()
+    # Snapshot of the product when it was added to the order
+    unit_price = models.DecimalField(decimal_places=2, max_digits=10)
+    product_name = models.CharField(max_length=200)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderItemQuerySet.as_manager()
+
     class Meta:
-        ordering = ("-created_at",)
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(
+                fields=("-created_at", "-id"), name="orderitem_created_id_idx"
+            ),
+            models.Index(
+                fields=("order", "-created_at", "-id"),
+                name="orderitem_order_created_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=("order", "product"), name="unique_order_product"
+            ),
+        ]
 
     def __str__(self):
         return self.order.buyer.get_full_name()
 
+    def save(self, *args, **kwargs):
+        if self.unit_price is None:
+            self.snapshot_product()
+        super().save(*args, **kwargs)
+
+    def snapshot_product(self):
+        """
+        Copy the current price and name of the product onto the item
+        """
+        self.unit_price = self.product.price
+        self.product_name = self.product.name
+
     @cached_property
     def cost(self):
         """
         Total cost of the ordered item
+
+        Querysets of `OrderItem.objects.with_cost()` compute it in SQL.
         """
-        return round(self.quantity * self.product.price, 2)
+        return round(self.quantity * self.unit_price, 2)
+
+
+class StockReservation(models.Model):
+    """
+    Stock of a product held for an order between checkout and payment
+    """
+
+    order = models.ForeignKey(
+        Order, related_name="stock_reservations", on_delete=models.CASCADE
+    )
+    product = models.ForeignKey(
+        Product, related_name="stock_reservations", on_delete=models.CASCADE
+    )
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+    is_hot = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("-created_at", "-id")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("order", "product"), name="unique_order_product_reservation"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} for order {self.order_id}"
@@ -1,9 +1,6 @@
-from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy as _
 from rest_framework.permissions import BasePermission
 
-from orders.models import Order
-
 
 class IsOrderPending(BasePermission):
     """
@@ -21,15 +18,17 @@ class IsOrderPending(BasePermission):
 class IsOrderItemByBuyerOrAdmin(BasePermission):
     """
     Check if order item is owned by appropriate buyer or admin
+
+    The view has to use `ParentOrderMixin`.
     """
 
     def has_permission(self, request, view):
-        order_id = view.kwargs.get("order_id")
-        order = get_object_or_404(Order, id=order_id)
-        return order.buyer == request.user or request.user.is_staff
+        order = view.get_parent_order()
+        return order.buyer_id == request.user.id or request.user.is_staff
 
     def has_object_permission(self, request, view, obj):
-        return obj.order.buyer == request.user or request.user.is_staff
+        order = view.get_parent_order()
+        return order.buyer_id == request.user.id or request.user.is_staff
 
 
 class IsOrderByBuyerOrAdmin(BasePermission):
@@ -41,12 +40,14 @@ class IsOrderByBuyerOrAdmin(BasePermission):
         return request.user.is_authenticated is True
 
     def has_object_permission(self, request, view, obj):
-        return obj.buyer == request.user or request.user.is_staff
+        return obj.buyer_id == request.user.id or request.user.is_staff
 
 
 class IsOrderItemPending(BasePermission):
     """
     Check the status of order is pending or completed before creating, updating and deleting order items
+
+    The view has to use `ParentOrderMixin`.
     """
 
     message = _(
@@ -54,8 +55,7 @@ class IsOrderItemPending(BasePermission):
     )
 
     def has_permission(self, request, view):
-        order_id = view.kwargs.get("order_id")
-        order = get_object_or_404(Order, id=order_id)
+        order = view.get_parent_order()
 
         if view.action in ("list",):
             return True
@@ -65,4 +65,4 @@ class IsOrderItemPending(BasePermission):
     def has_object_permission(self, request, view, obj):
         if view.action in ("retrieve",):
             return True
-        return obj.order.status == "P"
+        return view.get_parent_order().status == "P"
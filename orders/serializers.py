@@ -1,15 +1,56 @@
+from collections.abc import Mapping
+
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
 
+from core.serializers import CachedPrimaryKeyRelatedField, SparseFieldsetMixin
+from orders.inventory import get_available_quantity
 from orders.models import Order, OrderItem
+from products.models import Product
+from users.serializers import AddressReadOnlySerializer
+
+DUPLICATE_PRODUCT_ERROR = {"product": [_("Product already exists in your order.")]}
+
+
+class OrderItemListSerializer(serializers.ListSerializer):
+    """
+    Validate a list of order items against a single fetch of their products
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+
+        product_ids = set()
+        for item in data:
+            product_id = item.get("product") if isinstance(item, Mapping) else None
+            if isinstance(product_id, (int, str)) and str(product_id).isdigit():
+                product_ids.add(int(product_id))
+
+        self.child.instance_cache = {"product": Product.objects.in_bulk(product_ids)}
+        try:
+            return super().to_internal_value(data)
+        finally:
+            self.child.instance_cache = {}
+
+    def validate(self, attrs):
+        product_ids = [item["product"].id for item in attrs]
+        if len(product_ids) != len(set(product_ids)):
+            raise serializers.ValidationError(DUPLICATE_PRODUCT_ERROR)
+
+        return attrs
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
     """
     Serializer class for serializing order items
+
+    A product can be in an order only once, which the database enforces.
     """
 
+    product = CachedPrimaryKeyRelatedField(queryset=Product.objects.all())
     price = serializers.SerializerMethodField()
     cost = serializers.SerializerMethodField()
 
@@ -19,44 +60,58 @@ class OrderItemSerializer(serializers.ModelSerializer):
             "id",
             "order",
             "product",
+            "product_name",
             "quantity",
             "price",
             "cost",
             "created_at",
             "updated_at",
         )
-        read_only_fields = ("order",)
+        read_only_fields = ("order", "product_name")
+        list_serializer_class = OrderItemListSerializer
 
     def validate(self, validated_data):
         order_quantity = validated_data["quantity"]
-        product_quantity = validated_data["product"].quantity
+        product_quantity = get_available_quantity(validated_data["product"])
 
-        order_id = self.context["view"].kwargs.get("order_id")
         product = validated_data["product"]
-        current_item = OrderItem.objects.filter(order__id=order_id, product=product)
 
         if order_quantity > product_quantity:
             error = {"quantity": _("Ordered quantity is more than the stock.")}
             raise serializers.ValidationError(error)
 
-        if not self.instance and current_item.count() > 0:
-            error = {"product": _("Product already exists in your order.")}
-            raise serializers.ValidationError(error)
-
-        if self.context["request"].user == product.seller:
+        if self.context["request"].user.id == product.seller_id:
             error = _("Adding your own product to your order is not allowed")
             raise PermissionDenied(error)
 
+        if not self.instance or self.instance.product_id != product.id:
+            validated_data["unit_price"] = product.price
+            validated_data["product_name"] = product.name
+
         return validated_data
 
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(DUPLICATE_PRODUCT_ERROR)
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(DUPLICATE_PRODUCT_ERROR)
+
     def get_price(self, obj):
-        return obj.product.price
+        return obj.unit_price
 
     def get_cost(self, obj):
         return obj.cost
 
 
-class OrderReadSerializer(serializers.ModelSerializer):
+class OrderReadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer class for reading orders
     """
@@ -75,10 +130,16 @@ class OrderReadSerializer(serializers.ModelSerializer):
             "payment",
             "order_items",
             "total_cost",
+            "item_count",
             "status",
             "created_at",
             "updated_at",
         )
+        expandable_fields = {
+            "shipping_address": (AddressReadOnlySerializer, {}),
+            "billing_address": (AddressReadOnlySerializer, {}),
+        }
+        field_dependencies = {"total_cost": ("total_cost",)}
 
     def get_total_cost(self, obj):
         return obj.total_cost
@@ -107,24 +168,59 @@ class OrderWriteSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("status",)
 
+    @transaction.atomic
     def create(self, validated_data):
         orders_data = validated_data.pop("order_items")
         order = Order.objects.create(**validated_data)
 
-        for order_data in orders_data:
-            OrderItem.objects.create(order=order, **order_data)
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, **order_data) for order_data in orders_data
+        )
 
+        Order.objects.filter(id=order.id).refresh_totals()
         return order
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         orders_data = validated_data.pop("order_items", None)
         orders = list((instance.order_items).all())
 
         if orders_data:
-            for order_data in orders_data:
-                order = orders.pop(0)
-                order.product = order_data.get("product", order.product)
-                order.quantity = order_data.get("quantity", order.quantity)
-                order.save()
+            try:
+                with transaction.atomic():
+                    for order_data in orders_data:
+                        order = orders.pop(0)
+                        product = order_data.get("product")
+                        if product is not None and product.id != order.product_id:
+                            order.product = product
+                            order.snapshot_product()
+                        order.quantity = order_data.get("quantity", order.quantity)
+                        order.save()
+            except IntegrityError:
+                raise serializers.ValidationError(
+                    {"order_items": DUPLICATE_PRODUCT_ERROR}
+                )
+
+            Order.objects.filter(id=instance.id).refresh_totals()
 
         return instance
+
+
+class OrderFilterSerializer(serializers.Serializer):
+    """
+    Serializer class for validating order list filters
+    """
+
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES, required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+    def validate(self, validated_data):
+        created_after = validated_data.get("created_after")
+        created_before = validated_data.get("created_before")
+
+        if created_after and created_before and created_after > created_before:
+            error = {"created_after": _("Start of the range is after its end.")}
+            raise serializers.ValidationError(error)
+
+        return validated_data
@@ -0,0 +1,11 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from orders.inventory import release_reservations
+from orders.models import Order, StockReservation
+
+
+@receiver(pre_delete, sender=Order)
+def release_order_stock(sender, instance, **kwargs):
+    # Reservations are deleted with the order, give their stock back first
+    release_reservations(StockReservation.objects.filter(order=instance))
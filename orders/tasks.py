@@ -0,0 +1,11 @@
+from celery import shared_task
+
+from orders.inventory import release_expired_reservations
+
+
+@shared_task()
+def release_expired_reservations_task():
+    """
+    Celery task to give back the stock held by expired checkouts
+    """
+    return release_expired_reservations()
@@ -0,0 +1,275 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.testing import QueryBudgetTestCase
+from orders.inventory import (
+    InsufficientStock,
+    commit_order_stock,
+    release_expired_reservations,
+    reserve_order_stock,
+)
+from orders.models import Order, OrderItem
+from orders.views import OrderItemViewSet, OrderViewSet
+from products import stock
+from products.models import Product, ProductCategory
+from products.testing import HotStockTestCase
+
+User = get_user_model()
+
+
+class OrderQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        seller = User.objects.create_user(username="seller", email="s@x.com")
+        category = ProductCategory.objects.create(name="Books")
+        products = [
+            Product.objects.create(
+                seller=seller, category=category, name=f"Book {i}", price="5.00"
+            )
+            for i in range(4)
+        ]
+        cls.orders = [Order.objects.create(buyer=cls.buyer) for _ in range(5)]
+        for order in cls.orders:
+            for product in products:
+                OrderItem.objects.create(order=order, product=product, quantity=1)
+        Order.objects.refresh_totals()
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.buyer)
+
+    def test_order_list(self):
+        self.assertQueryBudget(OrderViewSet, "list", reverse("orders:order-list"))
+
+    def test_order_retrieve(self):
+        self.assertQueryBudget(
+            OrderViewSet,
+            "retrieve",
+            reverse("orders:order-detail", args=(self.orders[0].id,)),
+        )
+
+    def test_order_item_list(self):
+        self.assertQueryBudget(
+            OrderItemViewSet,
+            "list",
+            f"/api/user/orders/{self.orders[0].id}/order-items/",
+        )
+
+    def test_order_item_retrieve(self):
+        item = self.orders[0].order_items.first()
+        self.assertQueryBudget(
+            OrderItemViewSet,
+            "retrieve",
+            f"/api/user/orders/{self.orders[0].id}/order-items/{item.id}/",
+        )
+
+
+class OrderItemTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        seller = User.objects.create_user(username="seller", email="s@x.com")
+        category = ProductCategory.objects.create(name="Books")
+        product = Product.objects.create(
+            seller=seller, category=category, name="Book", price="5.50", quantity=10
+        )
+        cls.order = Order.objects.create(buyer=cls.buyer)
+        cls.item = OrderItem.objects.create(
+            order=cls.order, product=product, quantity=1
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.buyer)
+
+    def test_update_returns_new_cost(self):
+        url = f"/api/user/orders/{self.order.id}/order-items/{self.item.id}/"
+        data = {"product": self.item.product_id, "quantity": 2}
+        response = self.client.patch(url, data)
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(Decimal(str(response.data["cost"])), Decimal("11.00"))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total_cost, Decimal("11.00"))
+
+
+class StockReservationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        seller = User.objects.create_user(username="seller", email="s@x.com")
+        category = ProductCategory.objects.create(name="Books")
+        cls.product = Product.objects.create(
+            seller=seller, category=category, name="Book", price="5.00", quantity=5
+        )
+
+    def create_order(self, quantity):
+        order = Order.objects.create(buyer=self.buyer)
+        OrderItem.objects.create(order=order, product=self.product, quantity=quantity)
+        return order
+
+    def assertStock(self, quantity, reserved):
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, quantity)
+        self.assertEqual(self.product.reserved_quantity, reserved)
+
+    def test_reserve_holds_stock(self):
+        order = self.create_order(3)
+        reserve_order_stock(order)
+
+        self.assertStock(5, 3)
+        self.assertEqual(order.stock_reservations.get().quantity, 3)
+
+    def test_reserve_does_not_oversell(self):
+        reserve_order_stock(self.create_order(3))
+        order = self.create_order(3)
+
+        with self.assertRaises(InsufficientStock) as raised:
+            reserve_order_stock(order)
+
+        self.assertEqual(raised.exception.product_ids, [self.product.id])
+        self.assertStock(5, 3)
+        self.assertFalse(order.stock_reservations.exists())
+
+    def test_reserve_again_replaces_previous_reservation(self):
+        order = self.create_order(3)
+        reserve_order_stock(order)
+        order.order_items.update(quantity=4)
+        reserve_order_stock(order)
+
+        self.assertStock(5, 4)
+        self.assertEqual(order.stock_reservations.get().quantity, 4)
+
+    def test_commit_takes_reserved_stock(self):
+        order = self.create_order(3)
+        reserve_order_stock(order)
+
+        self.assertEqual(commit_order_stock(order.id), [])
+        self.assertStock(2, 0)
+        self.assertFalse(order.stock_reservations.exists())
+
+    def test_commit_after_expiry_reports_missing_stock(self):
+        order = self.create_order(3)
+        reserve_order_stock(order)
+        order.stock_reservations.update(expires_at=timezone.now())
+        release_expired_reservations()
+        reserve_order_stock(self.create_order(4))
+
+        self.assertEqual(commit_order_stock(order.id), [self.product.id])
+        self.assertStock(5, 4)
+
+    def test_release_expired_reservations(self):
+        expired = self.create_order(3)
+        reserve_order_stock(expired)
+        expired.stock_reservations.update(expires_at=timezone.now())
+        reserve_order_stock(self.create_order(1))
+
+        self.assertEqual(release_expired_reservations(), 1)
+        self.assertStock(5, 1)
+        self.assertFalse(expired.stock_reservations.exists())
+
+
+class HotStockReservationTests(HotStockTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        seller = User.objects.create_user(username="seller", email="s@x.com")
+        category = ProductCategory.objects.create(name="Books")
+        cls.product = Product.objects.create(
+            seller=seller,
+            category=category,
+            name="Book",
+            price="5.00",
+            quantity=5,
+            is_hot=True,
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.order = Order.objects.create(buyer=self.buyer)
+        OrderItem.objects.create(order=self.order, product=self.product, quantity=3)
+        reserve_order_stock(self.order)
+
+    def test_reserve_takes_from_counter(self):
+        self.assertEqual(self.get_available(self.product), 2)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved_quantity, 0)
+        self.assertTrue(self.order.stock_reservations.get().is_hot)
+
+    def test_reserve_does_not_oversell(self):
+        order = Order.objects.create(buyer=self.buyer)
+        OrderItem.objects.create(order=order, product=self.product, quantity=3)
+
+        with self.assertRaises(InsufficientStock):
+            reserve_order_stock(order)
+
+        self.assertEqual(self.get_available(self.product), 2)
+        self.assertFalse(order.stock_reservations.exists())
+
+    def test_failed_checkout_keeps_previous_reservation(self):
+        self.order.order_items.update(quantity=6)
+
+        with self.assertRaises(InsufficientStock):
+            reserve_order_stock(self.order)
+
+        self.assertEqual(self.get_available(self.product), 2)
+        self.assertEqual(self.order.stock_reservations.get().quantity, 3)
+
+    def test_checkout_again_gives_previous_reservation_back(self):
+        self.order.order_items.update(quantity=5)
+        reserve_order_stock(self.order)
+
+        self.assertEqual(self.get_available(self.product), 0)
+        self.assertEqual(self.order.stock_reservations.get().quantity, 5)
+
+    def test_commit_sells_from_counter(self):
+        self.assertEqual(commit_order_stock(self.order.id), [])
+
+        self.assertEqual(self.get_available(self.product), 2)
+        self.assertEqual(self.get_sold(self.product), 3)
+        self.assertFalse(self.order.stock_reservations.exists())
+
+        stock.reconcile()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 2)
+
+    def test_release_gives_stock_back_on_commit(self):
+        self.order.stock_reservations.update(expires_at=timezone.now())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            release_expired_reservations()
+            self.assertEqual(self.get_available(self.product), 2)
+
+        self.assertEqual(self.get_available(self.product), 5)
+
+    def test_rolled_back_release_keeps_stock_held(self):
+        self.order.stock_reservations.update(expires_at=timezone.now())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                release_expired_reservations()
+                raise RuntimeError
+
+        self.assertEqual(self.get_available(self.product), 2)
+        self.assertTrue(self.order.stock_reservations.exists())
+
+
+class OrderSaveTests(TestCase):
+    def test_save_keeps_maintained_totals(self):
+        buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        order = Order.objects.create(buyer=buyer)
+        Order.objects.filter(id=order.id).update(total_cost=10, item_count=2)
+
+        order.status = Order.COMPLETED
+        order.save()
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, Order.COMPLETED)
+        self.assertEqual(order.total_cost, 10)
+        self.assertEqual(order.item_count, 2)
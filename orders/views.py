@@ -1,6 +1,9 @@
-from django.shortcuts import get_object_or_404
+from django.db import transaction
 from rest_framework import viewsets
 
+from core.mixins import ActionPermissionMixin, QueryBudgetMixin, SparseFieldsetViewMixin
+from orders.filters import OrderFilter
+from orders.mixins import ParentOrderMixin
 from orders.models import Order, OrderItem
 from orders.permissions import (
     IsOrderByBuyerOrAdmin,
@@ -15,38 +18,67 @@ from orders.serializers import (
 )
 
 
-class OrderItemViewSet(viewsets.ModelViewSet):
+class OrderItemViewSet(
+    QueryBudgetMixin, ActionPermissionMixin, ParentOrderMixin, viewsets.ModelViewSet
+):
     """
     CRUD order items that are associated with the current order id.
     """
 
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
-    permission_classes = [IsOrderItemByBuyerOrAdmin]
+    permission_classes = (IsOrderItemByBuyerOrAdmin,)
+    action_permission_classes = {
+        ("create", "update", "partial_update", "destroy"): (IsOrderItemPending,),
+    }
+    query_budget = {"list": 2, "retrieve": 2}
 
     def get_queryset(self):
         res = super().get_queryset()
-        order_id = self.kwargs.get("order_id")
-        return res.filter(order__id=order_id)
+        res = res.filter(order__id=self.kwargs.get("order_id"))
+        # Writes change the quantity, an annotated cost would be stale
+        if self.action in ("list", "retrieve"):
+            res = res.with_cost()
+        return res
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        order = get_object_or_404(Order, id=self.kwargs.get("order_id"))
+        order = self.get_parent_order()
         serializer.save(order=order)
+        Order.objects.filter(id=order.id).refresh_totals()
 
-    def get_permissions(self):
-        if self.action in ("create", "update", "partial_update", "destroy"):
-            self.permission_classes += [IsOrderItemPending]
+    @transaction.atomic
+    def perform_update(self, serializer):
+        instance = serializer.save()
+        Order.objects.filter(id=instance.order_id).refresh_totals()
 
-        return super().get_permissions()
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        Order.objects.filter(id=instance.order_id).refresh_totals()
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(
+    QueryBudgetMixin,
+    ActionPermissionMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
     """
     CRUD orders of a user
+
+    Read actions accept `?fields=` and `?expand=shipping_address,billing_address`.
+    Orders can be filtered by `status` and by a `created_after`/`created_before`
+    range, and are listed newest first a page at a time.
     """
 
     queryset = Order.objects.all()
-    permission_classes = [IsOrderByBuyerOrAdmin]
+    filter_backends = (OrderFilter,)
+    permission_classes = (IsOrderByBuyerOrAdmin,)
+    action_permission_classes = {
+        ("update", "partial_update", "destroy"): (IsOrderPending,),
+    }
+    query_budget = {"list": 4, "retrieve": 4}
 
     def get_serializer_class(self):
         if self.action in ("create", "update", "partial_update", "destroy"):
@@ -57,10 +89,4 @@ class OrderViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         res = super().get_queryset()
         user = self.request.user
-        return res.filter(buyer=user)
-
-    def get_permissions(self):
-        if self.action in ("update", "partial_update", "destroy"):
-            self.permission_classes += [IsOrderPending]
-
-        return super().get_permissions()
+        return res.filter(buyer=user).select_related("buyer", "payment").with_items()
@@ -31,7 +31,10 @@ class Payment(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ("-created_at",)
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(fields=("-created_at", "-id"), name="payment_created_id_idx"),
+        ]
 
     def __str__(self):
         return self.order.buyer.get_full_name()
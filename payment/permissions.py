@@ -1,9 +1,6 @@
-from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy as _
 from rest_framework.permissions import BasePermission
 
-from orders.models import Order
-
 
 class IsPaymentByUser(BasePermission):
     """
@@ -35,9 +32,7 @@ class IsPaymentForOrderNotCompleted(BasePermission):
 
     def has_permission(self, request, view):
         if request.user.is_authenticated:
-            order_id = view.kwargs.get("order_id")
-            order = get_object_or_404(Order, id=order_id)
-            return order.status != "C"
+            return view.get_parent_order().status != "C"
         return False
 
 
@@ -48,9 +43,8 @@ class DoesOrderHaveAddress(BasePermission):
 
     def has_permission(self, request, view):
         if request.user.is_authenticated:
-            order_id = view.kwargs.get("order_id")
-            order = get_object_or_404(Order, id=order_id)
-            return order.shipping_address and order.billing_address
+            order = view.get_parent_order()
+            return bool(order.shipping_address_id and order.billing_address_id)
         return False
 
 
@@ -1,12 +1,13 @@
 from rest_framework import serializers
 
+from core.serializers import SparseFieldsetMixin
 from orders.models import Order
 from payment.models import Payment
 from users.models import Address
 from users.serializers import BillingAddressSerializer, ShippingAddressSerializer
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer to CRUD payments for an order.
     """
@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from analytics.models import SellerProductDailySales
+from core.testing import QueryBudgetTestCase
+from orders.inventory import reserve_order_stock
+from orders.models import Order, OrderItem
+from payment.models import Payment
+from payment.views import PaymentViewSet
+from products.models import Product, ProductCategory
+
+User = get_user_model()
+
+
+class PaymentQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        cls.payments = [
+            Payment.objects.create(
+                order=Order.objects.create(buyer=cls.buyer),
+                payment_option=Payment.STRIPE,
+            )
+            for _ in range(3)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.buyer)
+
+    def test_payment_list(self):
+        self.assertQueryBudget(PaymentViewSet, "list", reverse("payment:payment-list"))
+
+    def test_payment_retrieve(self):
+        self.assertQueryBudget(
+            PaymentViewSet,
+            "retrieve",
+            reverse("payment:payment-detail", args=(self.payments[0].id,)),
+        )
+
+
+@mock.patch("payment.views.send_payment_success_email_task")
+@mock.patch("payment.views.stripe.Webhook.construct_event")
+class StripeWebhookTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        seller = User.objects.create_user(username="seller", email="s@x.com")
+        category = ProductCategory.objects.create(name="Books")
+        cls.product = Product.objects.create(
+            seller=seller, category=category, name="Book", price="5.00", quantity=5
+        )
+        cls.order = Order.objects.create(buyer=buyer)
+        OrderItem.objects.create(order=cls.order, product=cls.product, quantity=2)
+        Payment.objects.create(order=cls.order, payment_option=Payment.STRIPE)
+
+    def setUp(self):
+        reserve_order_stock(self.order)
+
+    def post_completed_event(self, construct_event):
+        construct_event.return_value = {
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "customer_details": {"email": "b@x.com"},
+                    "metadata": {"order_id": str(self.order.id)},
+                }
+            },
+        }
+        return self.client.post(
+            reverse("payment:stripe_webhook"), {}, HTTP_STRIPE_SIGNATURE="signature"
+        )
+
+    def test_completed_checkout_takes_stock(self, construct_event, email_task):
+        response = self.post_completed_event(construct_event)
+
+        self.assertEqual(response.status_code, 200)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, Order.COMPLETED)
+        self.assertIsNotNone(self.order.completed_at)
+        self.assertEqual(self.order.payment.status, Payment.COMPLETED)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 3)
+        self.assertEqual(self.product.reserved_quantity, 0)
+        self.assertEqual(SellerProductDailySales.objects.get().units, 2)
+
+    def test_replayed_event_takes_stock_once(self, construct_event, email_task):
+        for _ in range(2):
+            response = self.post_completed_event(construct_event)
+            self.assertEqual(response.status_code, 200)
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 3)
+        self.assertEqual(SellerProductDailySales.objects.get().units, 2)
+        email_task.delay.assert_called_once_with("b@x.com")
+
+
+class PaymentUpdateTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        cls.payment = Payment.objects.create(
+            order=Order.objects.create(buyer=cls.buyer),
+            payment_option=Payment.STRIPE,
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.buyer)
+
+    def test_fields_do_not_filter_the_request_body(self):
+        url = reverse("payment:payment-detail", args=(self.payment.id,))
+        response = self.client.patch(
+            f"{url}?fields=id", {"payment_option": Payment.PAYPAL}
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["payment_option"], Payment.PAYPAL)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.payment_option, Payment.PAYPAL)
@@ -1,13 +1,27 @@
+import logging
+import math
+
 import stripe
 from django.conf import settings
+from django.db import transaction
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.generics import RetrieveUpdateAPIView
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
-from orders.models import Order
+from analytics.rollup import record_order_sales
+from core.mixins import ActionPermissionMixin, QueryBudgetMixin, SparseFieldsetViewMixin
+from orders.inventory import (
+    InsufficientStock,
+    commit_order_stock,
+    release_reservations,
+    reserve_order_stock,
+)
+from orders.mixins import ParentOrderMixin
+from orders.models import Order, StockReservation
 from orders.permissions import IsOrderByBuyerOrAdmin
 from payment.models import Payment
 from payment.permissions import (
@@ -22,47 +36,48 @@ from payment.tasks import send_payment_success_email_task
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+logger = logging.getLogger(__name__)
 
-class PaymentViewSet(ModelViewSet):
+
+class PaymentViewSet(
+    QueryBudgetMixin, ActionPermissionMixin, SparseFieldsetViewMixin, ModelViewSet
+):
     """
     CRUD payment for an order
     """
 
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
-    permission_classes = [IsPaymentByUser]
+    permission_classes = (IsPaymentByUser,)
+    action_permission_classes = {
+        ("update", "partial_update", "destroy"): (IsPaymentPending,),
+    }
+    query_budget = {"list": 2, "retrieve": 2}
 
     def get_queryset(self):
         res = super().get_queryset()
         user = self.request.user
-        return res.filter(order__buyer=user)
-
-    def get_permissions(self):
-        if self.action in ("update", "partial_update", "destroy"):
-            self.permission_classes += [IsPaymentPending]
+        return res.filter(order__buyer=user).select_related("order__buyer")
 
-        return super().get_permissions()
 
-
-class CheckoutAPIView(RetrieveUpdateAPIView):
+class CheckoutAPIView(ActionPermissionMixin, RetrieveUpdateAPIView):
     """
     Create, Retrieve, Update billing address, shipping address and payment of an order
     """
 
-    queryset = Order.objects.all()
+    queryset = Order.objects.select_related(
+        "buyer", "payment", "shipping_address", "billing_address"
+    )
     serializer_class = CheckoutSerializer
-    permission_classes = [IsOrderByBuyerOrAdmin]
-
-    def get_permissions(self):
-        if self.request.method in ("PUT", "PATCH"):
-            self.permission_classes += [IsOrderPendingWhenCheckout]
+    permission_classes = (IsOrderByBuyerOrAdmin,)
+    action_permission_classes = {("PUT", "PATCH"): (IsOrderPendingWhenCheckout,)}
 
-        return super().get_permissions()
 
-
-class StripeCheckoutSessionCreateAPIView(APIView):
+class StripeCheckoutSessionCreateAPIView(ParentOrderMixin, APIView):
     """
     Create and return checkout session ID for order payment of type 'Stripe'
+
+    The stock of the order is reserved until the session expires.
     """
 
     permission_classes = (
@@ -71,22 +86,67 @@ class StripeCheckoutSessionCreateAPIView(APIView):
     )
 
     def post(self, request, *args, **kwargs):
-        order = get_object_or_404(Order, id=self.kwargs.get("order_id"))
+        order = self.get_parent_order()
+
+        try:
+            expires_at = reserve_order_stock(order)
+        except InsufficientStock as e:
+            return Response(
+                {
+                    "detail": "Some products of the order are out of stock.",
+                    "products": e.product_ids,
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
 
+        try:
+            checkout_session = stripe.checkout.Session.create(
+                payment_method_types=["card"],
+                line_items=self.get_line_items(order),
+                metadata={"order_id": order.id},
+                mode="payment",
+                expires_at=math.ceil(expires_at.timestamp()),
+                success_url=settings.PAYMENT_SUCCESS_URL,
+                cancel_url=settings.PAYMENT_CANCEL_URL,
+            )
+        except Exception:
+            # Don't hold the stock of a checkout that never started
+            with transaction.atomic():
+                release_reservations(StockReservation.objects.filter(order=order))
+            raise
+
+        return Response(
+            {"sessionId": checkout_session["id"]}, status=status.HTTP_201_CREATED
+        )
+
+    def get_line_items(self, order):
+        """
+        Stripe line items of the order items, priced from their snapshot
+        """
         order_items = []
 
-        for order_item in order.order_items.all():
+        for order_item in order.order_items.select_related("product"):
             product = order_item.product
             quantity = order_item.quantity
 
+            # Stripe doesn't need the full size upload, send the large variant
+            images = []
+            large = product.image_variants.get("large", {}).get("jpeg")
+            if large:
+                images.append(
+                    f"{settings.BACKEND_DOMAIN}{product.image.storage.url(large)}"
+                )
+            elif product.image:
+                images.append(f"{settings.BACKEND_DOMAIN}{product.image.url}")
+
             data = {
                 "price_data": {
                     "currency": "usd",
-                    "unit_amount_decimal": product.price,
+                    "unit_amount_decimal": order_item.unit_price,
                     "product_data": {
-                        "name": product.name,
+                        "name": order_item.product_name,
                         "description": product.desc,
-                        "images": [f"{settings.BACKEND_DOMAIN}{product.image.url}"],
+                        "images": images,
                     },
                 },
                 "quantity": quantity,
@@ -94,18 +154,7 @@ class StripeCheckoutSessionCreateAPIView(APIView):
 
             order_items.append(data)
 
-        checkout_session = stripe.checkout.Session.create(
-            payment_method_types=["card"],
-            line_items=order_items,
-            metadata={"order_id": order.id},
-            mode="payment",
-            success_url=settings.PAYMENT_SUCCESS_URL,
-            cancel_url=settings.PAYMENT_CANCEL_URL,
-        )
-
-        return Response(
-            {"sessionId": checkout_session["id"]}, status=status.HTTP_201_CREATED
-        )
+        return order_items
 
 
 class StripeWebhookAPIView(APIView):
@@ -134,14 +183,31 @@ class StripeWebhookAPIView(APIView):
             print("Payment successfull")
 
             payment = get_object_or_404(Payment, order=order_id)
-            payment.status = "C"
-            payment.save()
-
             order = get_object_or_404(Order, id=order_id)
-            order.status = "C"
-            order.save()
 
-            # TODO - Decrease product quantity
+            with transaction.atomic():
+                # Stripe may deliver an event more than once, only the
+                # delivery that completes the order takes the stock
+                now = timezone.now()
+                completed = Order.objects.filter(
+                    id=order.id, status=Order.PENDING
+                ).update(status=Order.COMPLETED, completed_at=now, updated_at=now)
+                if not completed:
+                    return Response(status=status.HTTP_200_OK)
+
+                payment.status = Payment.COMPLETED
+                payment.save()
+
+                record_order_sales(order.id)
+                # Last, its Redis counters are not rolled back with the rest
+                missing = commit_order_stock(order.id)
+
+            if missing:
+                logger.error(
+                    "Order %s was paid but products %s are out of stock",
+                    order.id,
+                    missing,
+                )
 
             send_payment_success_email_task.delay(customer_email)
 
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+PRODUCTS = "products"
+CATEGORIES = "categories"
+RECOMMENDATIONS = "recommendations"
+
+
+def get_version(resource):
+    """
+    Current cache version of a resource.
+
+    The version is the time of the last change in nanoseconds rather than a
+    counter, so a version lost by eviction can never come back as an old one.
+    """
+    key = f"{resource}:version"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(*resources):
+    """
+    Invalidate every cache entry keyed on the version of the given resources.
+
+    Inside a transaction the version is bumped once it commits, a read in
+    between would still see the old rows and cache them under the new version.
+    """
+
+    def bump():
+        version = time.time_ns()
+        cache.set_many({f"{resource}:version": version for resource in resources}, None)
+
+    transaction.on_commit(bump)
+
+
+def make_key(resource, name, params):
+    """
+    Build a versioned cache key for `name` and the given parameters
+    """
+    digest = hashlib.md5(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{resource}:{get_version(resource)}:{name}:{digest}"
+
+
+class CachedReadMixin:
+    """
+    Cache list and retrieve responses under keys versioned on `cache_resource`
+    """
+
+    cache_resource = None
+
+    def get_cache_key(self, request):
+        params = {"path": request.path, "query": sorted(request.query_params.lists())}
+        return make_key(self.cache_resource, self.action, params)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Answer list and retrieve requests with `ETag` and `Last-Modified` headers
+    taken from the version of `cache_resource`, and with a 304 response when
+    the client's copy is still current. Nothing is queried or serialized
+    for a 304.
+    """
+
+    cache_resource = None
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        version = get_version(self.cache_resource)
+        representation = (
+            f"{version}:{request.accepted_media_type}:{request.get_full_path()}"
+        )
+        etag = quote_etag(hashlib.md5(representation.encode()).hexdigest())
+        last_modified = version // 1_000_000_000
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,80 @@
+from collections import defaultdict
+
+from django.db.models import Count, F, Q
+
+from products.models import Product, ProductCategory
+
+
+def get_count_deltas(states):
+    """
+    Turn `(category_id, in_stock, sign)` changes into per category
+    `(product_count, in_stock_count)` deltas
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for category_id, in_stock, sign in states:
+        deltas[category_id][0] += sign
+        deltas[category_id][1] += sign if in_stock else 0
+    return {category_id: delta for category_id, delta in deltas.items() if any(delta)}
+
+
+def get_stock_changes(rows):
+    """
+    Turn `(category_id, quantity_before, quantity_after)` rows of products
+    whose stock changed into changes for `get_count_deltas`
+    """
+    changes = []
+    for category_id, before, after in rows:
+        if (before > 0) != (after > 0):
+            changes += [(category_id, before > 0, -1), (category_id, after > 0, 1)]
+    return changes
+
+
+def apply_count_deltas(deltas):
+    """
+    Adjust the product counters of categories in place with `F()` updates
+    """
+    for category_id, (count_delta, in_stock_delta) in deltas.items():
+        ProductCategory.objects.filter(pk=category_id).update(
+            product_count=F("product_count") + count_delta,
+            in_stock_count=F("in_stock_count") + in_stock_delta,
+        )
+
+
+def refresh_category_counts(category_ids=None):
+    """
+    Recompute the product counters of the given categories, or of every
+    category, with one grouped query
+    """
+    categories = ProductCategory.objects.all()
+    if category_ids is not None:
+        categories = categories.filter(pk__in=category_ids)
+
+    products = Product.objects.order_by()
+    if category_ids is not None:
+        products = products.filter(category_id__in=category_ids)
+
+    counts = {
+        row["category_id"]: row
+        for row in products.values("category_id").annotate(
+            product_count=Count("id"),
+            in_stock_count=Count("id", filter=Q(quantity__gt=0)),
+        )
+    }
+
+    updated = []
+    for category in categories.only("id", "product_count", "in_stock_count"):
+        row = counts.get(category.id, {})
+        product_count = row.get("product_count", 0)
+        in_stock_count = row.get("in_stock_count", 0)
+        if (category.product_count, category.in_stock_count) != (
+            product_count,
+            in_stock_count,
+        ):
+            category.product_count = product_count
+            category.in_stock_count = in_stock_count
+            updated.append(category)
+
+    ProductCategory.objects.bulk_update(
+        updated, ("product_count", "in_stock_count"), batch_size=1000
+    )
+    return len(updated)
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from products.formats import CSV, JSONL
+from products.models import Product
+
+CONTENT_TYPES = {CSV: "text/csv", JSONL: "application/x-ndjson"}
+
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "desc",
+    "price",
+    "quantity",
+    "category",
+    "seller",
+    "created_at",
+    "updated_at",
+)
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def export_rows(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Lazily yield every product as a dict of `EXPORT_FIELDS`.
+
+    Rows are fetched as tuples through a server-side cursor, so only one
+    chunk of the table is held in memory at a time.
+    """
+    queryset = (
+        Product.objects.order_by("id")
+        .values_list(
+            "id",
+            "name",
+            "desc",
+            "price",
+            "quantity",
+            "category__name",
+            "seller__first_name",
+            "seller__last_name",
+            "created_at",
+            "updated_at",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+    for row in queryset:
+        *values, first_name, last_name, created_at, updated_at = row
+        yield {
+            **dict(zip(EXPORT_FIELDS, values)),
+            "seller": f"{first_name} {last_name}".strip(),
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+
+def write_csv(rows, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if index % chunk_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode()
+
+
+def write_jsonl(rows, chunk_size):
+    lines = []
+
+    for row in rows:
+        lines.append(json.dumps(row, cls=DjangoJSONEncoder))
+        if len(lines) == chunk_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+
+    yield compressor.flush()
+
+
+def export_products(file_format=CSV, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the product catalog as encoded CSV or JSONL chunks, gzipped if
+    `compress` is set
+    """
+    writer = write_jsonl if file_format == JSONL else write_csv
+    chunks = writer(export_rows(chunk_size), chunk_size)
+
+    return gzip_stream(chunks) if compress else chunks
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Floor
+
+from products.cache import PRODUCTS, make_key
+
+
+def get_category_facet(queryset):
+    rows = (
+        queryset.values("category_id", "category__name")
+        .annotate(count=Count("id"))
+        .order_by("category__name")
+    )
+    return [
+        {"id": row["category_id"], "name": row["category__name"], "count": row["count"]}
+        for row in rows
+    ]
+
+
+def get_price_facet(queryset):
+    size = Decimal(settings.PRODUCT_FACET_PRICE_BUCKET_SIZE)
+    rows = (
+        queryset.annotate(bucket=Floor(F("price") / Value(size)))
+        .values("bucket")
+        .annotate(count=Count("id"))
+        .order_by("bucket")
+    )
+    return [
+        {
+            "min_price": int(row["bucket"]) * size,
+            "max_price": (int(row["bucket"]) + 1) * size,
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+
+
+def get_stock_facet(queryset):
+    return queryset.aggregate(
+        in_stock=Count("id", filter=Q(quantity__gt=0)),
+        out_of_stock=Count("id", filter=Q(quantity__lte=0)),
+    )
+
+
+def get_product_facets(queryset, filters):
+    """
+    Facet counts of the filtered products, cached per filter combination.
+
+    Each facet is a single grouped query and the cache key is versioned on
+    products, so any product change invalidates every cached combination.
+    """
+    key = make_key(PRODUCTS, "facets", filters)
+    facets = cache.get(key)
+
+    if facets is None:
+        queryset = queryset.order_by()
+        facets = {
+            "categories": get_category_facet(queryset),
+            "price": get_price_facet(queryset),
+            "stock": get_stock_facet(queryset),
+        }
+        cache.set(key, facets, settings.PRODUCT_FACETS_CACHE_TIMEOUT)
+
+    return facets
@@ -0,0 +1,53 @@
+from rest_framework.filters import BaseFilterBackend
+
+from products.search import search_products
+from products.serializers import ProductFilterSerializer
+
+
+def filter_products(queryset, filters):
+    if filters.get("category"):
+        queryset = queryset.filter(category_id__in=filters["category"])
+    if filters.get("seller") is not None:
+        queryset = queryset.filter(seller_id=filters["seller"])
+    if filters.get("min_price") is not None:
+        queryset = queryset.filter(price__gte=filters["min_price"])
+    if filters.get("max_price") is not None:
+        queryset = queryset.filter(price__lte=filters["max_price"])
+    if filters.get("in_stock") is True:
+        queryset = queryset.filter(quantity__gt=0)
+    elif filters.get("in_stock") is False:
+        queryset = queryset.filter(quantity__lte=0)
+
+    return queryset
+
+
+class ProductFilter(BaseFilterBackend):
+    """
+    Filter products by category, seller, price range and stock
+    """
+
+    def get_filters(self, request):
+        serializer = ProductFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_products(queryset, self.get_filters(request))
+
+
+class ProductSearchFilter(BaseFilterBackend):
+    """
+    Full text search on product name and description using `?search=`
+    """
+
+    search_param = "search"
+
+    def get_search_query(self, request):
+        return request.query_params.get(self.search_param, "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if not query:
+            return queryset
+
+        return search_products(queryset, query)
@@ -0,0 +1,3 @@
+CSV = "csv"
+JSONL = "jsonl"
+FORMATS = (CSV, JSONL)
@@ -0,0 +1,72 @@
+import io
+import os
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+VARIANT_SIZES = {
+    "thumbnail": (150, 150),
+    "medium": (600, 600),
+    "large": (1200, 1200),
+}
+
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def variant_name(name, size, extension):
+    root, _ = os.path.splitext(name)
+    return f"{root}_{size}.{extension}"
+
+
+def generate_variants(field_file):
+    """
+    Save resized WebP and JPEG copies of an uploaded image next to it.
+
+    Returns the storage names of the variants keyed by size and format, plus
+    the name of the source image they were generated from.
+    """
+    storage = field_file.storage
+
+    with field_file.open("rb") as f:
+        source = ImageOps.exif_transpose(Image.open(f))
+        source = source.convert("RGB")
+
+    variants = {"source": field_file.name}
+
+    for size, dimensions in VARIANT_SIZES.items():
+        image = source.copy()
+        image.thumbnail(dimensions, Image.Resampling.LANCZOS)
+        variants[size] = {}
+
+        for extension, (image_format, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, image_format, **options)
+
+            name = variant_name(field_file.name, size, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            variants[size][extension] = storage.save(
+                name, ContentFile(buffer.getvalue())
+            )
+
+    return variants
+
+
+def get_variant_urls(storage, variants, request=None):
+    """
+    URLs of the stored variants keyed by size and format
+    """
+    urls = {}
+
+    for size in VARIANT_SIZES:
+        if size not in variants:
+            continue
+        urls[size] = {}
+        for extension, name in variants[size].items():
+            url = storage.url(name)
+            urls[size][extension] = request.build_absolute_uri(url) if request else url
+
+    return urls
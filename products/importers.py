@@ -0,0 +1,132 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+
+from products.cache import CATEGORIES, PRODUCTS, bump_version
+from products.counters import apply_count_deltas, get_count_deltas
+from products.formats import CSV, JSONL
+from products.models import Product, ProductCategory
+from products.search import update_search_index
+from products.serializers import ProductImportRowSerializer
+
+IMPORT_CHUNK_SIZE = 1000
+
+
+def guess_format(filename):
+    return JSONL if filename.lower().endswith((".jsonl", ".ndjson")) else CSV
+
+
+def read_csv(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(stream):
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f"Invalid JSON: {e}")
+
+
+def read_rows(stream, file_format):
+    """
+    Lazily yield `(line_number, row)` pairs of a CSV or JSONL text stream.
+    Rows that can't be decoded are yielded as the `ValueError` describing them.
+    """
+    if file_format == JSONL:
+        return read_jsonl(stream)
+    return read_csv(stream)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def resolve_categories(names):
+    """
+    Map category names to categories with one lookup, creating missing ones
+    """
+    categories = {}
+    for category in ProductCategory.objects.filter(name__in=names).order_by("id"):
+        categories.setdefault(category.name, category)
+
+    missing = [name for name in names if name not in categories]
+    if missing:
+        ProductCategory.objects.bulk_create(
+            [ProductCategory(name=name) for name in missing]
+        )
+        for category in ProductCategory.objects.filter(name__in=missing):
+            categories.setdefault(category.name, category)
+
+    return categories
+
+
+def import_chunk(rows, seller, on_error):
+    valid_rows = []
+    for line_number, row in rows:
+        if isinstance(row, ValueError):
+            on_error(line_number, {"non_field_errors": [str(row)]})
+            continue
+        if not isinstance(row, dict):
+            on_error(line_number, {"non_field_errors": ["Expected an object."]})
+            continue
+
+        serializer = ProductImportRowSerializer(data=row)
+        if serializer.is_valid():
+            valid_rows.append(serializer.validated_data)
+        else:
+            on_error(line_number, serializer.errors)
+
+    if not valid_rows:
+        return 0
+
+    with transaction.atomic():
+        categories = resolve_categories({row["category"] for row in valid_rows})
+        products = Product.objects.bulk_create(
+            [
+                Product(
+                    seller=seller,
+                    category=categories[row.pop("category")],
+                    **row,
+                )
+                for row in valid_rows
+            ]
+        )
+        update_search_index([product for product in products if product.id])
+        apply_count_deltas(
+            get_count_deltas(
+                (product.category_id, product.quantity > 0, 1) for product in products
+            )
+        )
+
+    return len(products)
+
+
+def import_products(rows, seller, chunk_size=IMPORT_CHUNK_SIZE, on_error=None):
+    """
+    Validate and insert products chunk by chunk so memory use does not grow
+    with the input size. Invalid rows are reported to `on_error` with their
+    line number and skipped.
+
+    Returns the number of created products.
+    """
+    on_error = on_error or (lambda line_number, errors: None)
+    created = 0
+
+    try:
+        for chunk in chunked(rows, chunk_size):
+            created += import_chunk(chunk, seller, on_error)
+    finally:
+        if created:
+            # Signals don't fire for bulk inserts
+            bump_version(PRODUCTS, CATEGORIES)
+
+    return created
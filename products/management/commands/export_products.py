@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.exporters import EXPORT_CHUNK_SIZE, export_products
+from products.formats import CSV, FORMATS
+
+
+class Command(BaseCommand):
+    help = "Export every product as CSV or JSONL without loading the table in memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", default="-", help="Path of the output file, or - for stdout"
+        )
+        parser.add_argument(
+            "--format", choices=FORMATS, default=CSV, dest="file_format"
+        )
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        chunks = export_products(
+            options["file_format"], options["gzip"], options["chunk_size"]
+        )
+
+        if output == "-":
+            stream = sys.stdout.buffer
+        else:
+            try:
+                stream = open(output, "wb")
+            except OSError as e:
+                raise CommandError(e)
+
+        for chunk in chunks:
+            stream.write(chunk)
+        stream.flush()
+
+        if output != "-":
+            stream.close()
+            self.stderr.write(self.style.SUCCESS(f"Exported products to {output}."))
@@ -0,0 +1,64 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from products.formats import FORMATS
+from products.importers import (
+    IMPORT_CHUNK_SIZE,
+    guess_format,
+    import_products,
+    read_rows,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Import products of a seller from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the file to import, or - for stdin")
+        parser.add_argument(
+            "--seller", required=True, help="Email or id of the selling user"
+        )
+        parser.add_argument("--format", choices=FORMATS, dest="file_format")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    def get_seller(self, seller):
+        lookup = {"pk": seller} if seller.isdigit() else {"email": seller}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"Seller '{seller}' does not exist.")
+
+    def handle(self, *args, **options):
+        seller = self.get_seller(options["seller"])
+        path = options["path"]
+        file_format = options["file_format"] or guess_format(path)
+        failed = 0
+
+        def on_error(line_number, errors):
+            nonlocal failed
+            failed += 1
+            self.stderr.write(f"Line {line_number}: {errors}")
+
+        if path == "-":
+            stream = sys.stdin
+        else:
+            try:
+                stream = open(path, newline="", encoding="utf-8-sig")
+            except OSError as e:
+                raise CommandError(e)
+
+        with stream:
+            created = import_products(
+                read_rows(stream, file_format),
+                seller,
+                chunk_size=options["chunk_size"],
+                on_error=on_error,
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {created} products, {failed} rows failed.")
+        )
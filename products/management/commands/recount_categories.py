@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from products.cache import CATEGORIES, bump_version
+from products.counters import refresh_category_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the product and in stock counters of every category."
+
+    def handle(self, *args, **options):
+        updated = refresh_category_counts()
+        if updated:
+            bump_version(CATEGORIES)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Fixed counters of {updated} categories.")
+        )
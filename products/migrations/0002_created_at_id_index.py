@@ -0,0 +1,29 @@
+# Generated by Django 4.0.4 on 2026-10-18 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='product',
+            options={'ordering': ('-created_at', '-id')},
+        ),
+        migrations.AlterModelOptions(
+            name='productcategory',
+            options={'ordering': ('-created_at', '-id'), 'verbose_name': 'Product Category', 'verbose_name_plural': 'Product Categories'},
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created_at', '-id'], name='product_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productcategory',
+            index=models.Index(fields=['-created_at', '-id'], name='category_created_id_idx'),
+        ),
+    ]
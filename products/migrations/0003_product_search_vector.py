@@ -0,0 +1,45 @@
+# Generated by Django 4.0.4 on 2026-10-18 18:56
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# The GIN index is PostgreSQL specific, so it is created here instead of in
+# `Product.Meta.indexes` to keep the migrations runnable on SQLite.
+CREATE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS product_search_vector_idx "
+    "ON products_product USING gin (search_vector)"
+)
+DROP_INDEX = "DROP INDEX IF EXISTS product_search_vector_idx"
+
+BACKFILL = (
+    "UPDATE products_product SET search_vector = "
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(\"desc\", '')), 'B')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(BACKFILL)
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_created_at_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
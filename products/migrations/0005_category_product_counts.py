@@ -0,0 +1,51 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:03
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_category_products(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    ProductCategory = apps.get_model('products', 'ProductCategory')
+
+    counts = (
+        Product.objects.order_by()
+        .values('category_id')
+        .annotate(
+            product_count=Count('id'),
+            in_stock_count=Count('id', filter=Q(quantity__gt=0)),
+        )
+    )
+    categories = []
+    for row in counts:
+        categories.append(
+            ProductCategory(
+                id=row['category_id'],
+                product_count=row['product_count'],
+                in_stock_count=row['in_stock_count'],
+            )
+        )
+    ProductCategory.objects.bulk_update(
+        categories, ('product_count', 'in_stock_count'), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productcategory',
+            name='in_stock_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='productcategory',
+            name='product_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_category_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_reserved_quantity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='is_hot',
+            field=models.BooleanField(default=False, help_text='Keep the stock in Redis during flash sales'),
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from core.models import MaintainedFieldsMixin
+
 User = get_user_model()
 
 
@@ -13,16 +16,26 @@ def product_image_path(instance, filename):
     return f"product/images/{instance.name}/{filename}"
 
 
-class ProductCategory(models.Model):
+class ProductCategory(MaintainedFieldsMixin, models.Model):
     name = models.CharField(_("Category name"), max_length=100)
     icon = models.ImageField(upload_to=category_image_path, blank=True)
+    icon_variants = models.JSONField(default=dict, blank=True, editable=False)
+    product_count = models.IntegerField(default=0, editable=False)
+    in_stock_count = models.IntegerField(default=0, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained with `F()` updates as products change
+    maintained_fields = ("product_count", "in_stock_count")
+
     class Meta:
         verbose_name = _("Product Category")
         verbose_name_plural = _("Product Categories")
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(fields=("-created_at", "-id"), name="category_created_id_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -32,7 +45,7 @@ def get_default_product_category():
     return ProductCategory.objects.get_or_create(name="Others")[0]
 
 
-class Product(models.Model):
+class Product(MaintainedFieldsMixin, models.Model):
     seller = models.ForeignKey(User, related_name="products", on_delete=models.CASCADE)
     category = models.ForeignKey(
         ProductCategory,
@@ -42,14 +55,72 @@ class Product(models.Model):
     name = models.CharField(max_length=200)
     desc = models.TextField(_("Description"), blank=True)
     image = models.ImageField(upload_to=product_image_path, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     price = models.DecimalField(decimal_places=2, max_digits=10)
     quantity = models.IntegerField(default=1)
+    reserved_quantity = models.PositiveIntegerField(default=0, editable=False)
+    is_hot = models.BooleanField(
+        default=False, help_text=_("Keep the stock in Redis during flash sales")
+    )
+    search_vector = SearchVectorField(null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained with `F()` updates by checkouts
+    maintained_fields = ("reserved_quantity",)
+
     class Meta:
-        ordering = ("-created_at",)
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(fields=("-created_at", "-id"), name="product_created_id_idx"),
+            models.Index(
+                fields=("category", "-created_at", "-id"),
+                name="product_category_created_idx",
+            ),
+            models.Index(
+                fields=("seller", "-created_at", "-id"),
+                name="product_seller_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+    @property
+    def available_quantity(self):
+        """
+        Stock that is not held by a pending checkout
+        """
+        return self.quantity - self.reserved_quantity
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counted_state()
+        instance._indexed_text = instance.get_indexed_text()
+        # Assume a product that was loaded without the flag was hot
+        instance._was_hot = instance.__dict__.get("is_hot", True)
+        return instance
+
+    def remember_counted_state(self):
+        """
+        Keep the values the category counters were last computed with, so a
+        save can adjust them by the difference only
+        """
+        self._counted_state = self.get_counted_state()
+
+    def get_indexed_text(self):
+        """
+        Name and description the search vector is built from, `None` when
+        they were not loaded
+        """
+        if {"name", "desc"} & self.get_deferred_fields():
+            return None
+        return (self.name, self.desc)
+
+    def get_counted_state(self):
+        fields = self.get_deferred_fields()
+        if "category_id" in fields or "quantity" in fields:
+            return None
+        return (self.category_id, self.quantity > 0)
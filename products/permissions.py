@@ -13,4 +13,12 @@ class IsSellerOrAdmin(BasePermission):
         if request.method in SAFE_METHODS:
             return True
 
-        return obj.seller == request.user or request.user.is_admin
+        return obj.seller_id == request.user.id or request.user.is_staff
+
+    def has_objects_permission(self, request, view, objs):
+        """
+        Check a whole batch of already fetched products at once
+        """
+        return request.user.is_staff or all(
+            obj.seller_id == request.user.id for obj in objs
+        )
@@ -0,0 +1,172 @@
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, FloatField, Value, When
+
+SEARCH_CONFIG = "english"
+
+# Matches in the product name weigh more than matches in the description
+NAME_WEIGHT = 1.0
+DESC_WEIGHT = 0.4
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def product_search_vector():
+    return SearchVector("name", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        "desc", weight="B", config=SEARCH_CONFIG
+    )
+
+
+def has_search_vector():
+    """
+    The tsvector column and its GIN index only exist on PostgreSQL
+    """
+    return connection.vendor == "postgresql"
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index used to rank products when the database has no
+    full text search support (SQLite development and test setups).
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(dict)
+        self._documents = {}
+        self._lock = threading.RLock()
+        self.is_built = False
+
+    def build(self, rows):
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            for product_id, name, desc in rows:
+                self._add(product_id, name, desc)
+            self.is_built = True
+
+    def add(self, product_id, name, desc):
+        with self._lock:
+            self._remove(product_id)
+            self._add(product_id, name, desc)
+
+    def remove(self, product_id):
+        with self._lock:
+            self._remove(product_id)
+
+    def search(self, query):
+        """
+        Return `(product_id, score)` pairs of products matching every term of
+        the query, best match first
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+
+            total = len(self._documents)
+            postings.sort(key=len)
+            matches = set(postings[0]).intersection(*postings[1:])
+
+            scores = {}
+            for posting in postings:
+                idf = math.log(1 + total / len(posting))
+                for product_id in matches:
+                    scores[product_id] = (
+                        scores.get(product_id, 0.0) + posting[product_id] * idf
+                    )
+
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+    def _add(self, product_id, name, desc):
+        terms = set()
+        for weight, text in ((NAME_WEIGHT, name), (DESC_WEIGHT, desc)):
+            for term in tokenize(text):
+                posting = self._postings[term]
+                posting[product_id] = posting.get(product_id, 0.0) + weight
+                terms.add(term)
+        self._documents[product_id] = terms
+
+    def _remove(self, product_id):
+        for term in self._documents.pop(product_id, ()):
+            posting = self._postings[term]
+            posting.pop(product_id, None)
+            if not posting:
+                del self._postings[term]
+
+
+product_index = InvertedIndex()
+
+
+def get_product_index():
+    """
+    Lazily build the in-memory index from the product table
+    """
+    from products.models import Product
+
+    if not product_index.is_built:
+        rows = Product.objects.values_list("id", "name", "desc").iterator(
+            chunk_size=2000
+        )
+        product_index.build(rows)
+    return product_index
+
+
+def update_search_index(products):
+    """
+    Refresh the search data of the given products after they were written
+    """
+    from products.models import Product
+
+    if has_search_vector():
+        ids = [product.id for product in products]
+        Product.objects.filter(id__in=ids).update(search_vector=product_search_vector())
+    elif product_index.is_built:
+        for product in products:
+            product_index.add(product.id, product.name, product.desc)
+
+
+def remove_from_search_index(product_ids):
+    if not has_search_vector() and product_index.is_built:
+        for product_id in product_ids:
+            product_index.remove(product_id)
+
+
+def search_products(queryset, query):
+    """
+    Filter the queryset down to products matching the query and annotate each
+    row with its `rank`, best match first
+    """
+    if has_search_vector():
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-id")
+        )
+
+    matches = get_product_index().search(query)
+    if not matches:
+        return queryset.none()
+
+    rank = Case(
+        *[When(id=product_id, then=Value(score)) for product_id, score in matches],
+        output_field=FloatField(),
+    )
+    return (
+        queryset.filter(id__in=[product_id for product_id, _ in matches])
+        .annotate(rank=rank)
+        .order_by("-rank", "-id")
+    )
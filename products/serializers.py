@@ -1,29 +1,123 @@
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from core.serializers import SparseFieldsetMixin
+from products.formats import CSV, FORMATS
+from products.images import get_variant_urls
 from products.models import Product, ProductCategory
 
 
-class ProductCategoryReadSerializer(serializers.ModelSerializer):
+class ProductCategoryReadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer class for product categories
     """
 
+    icon_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = ProductCategory
         fields = "__all__"
+        field_dependencies = {"icon_variants": ("icon", "icon_variants")}
+
+    def get_icon_variants(self, obj):
+        request = self.context.get("request")
+        return get_variant_urls(obj.icon.storage, obj.icon_variants, request)
 
 
-class ProductReadSerializer(serializers.ModelSerializer):
+class ProductReadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer class for reading products
     """
 
     seller = serializers.CharField(source="seller.get_full_name", read_only=True)
     category = serializers.CharField(source="category.name", read_only=True)
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
-        fields = "__all__"
+        exclude = ("search_vector", "reserved_quantity", "is_hot")
+        expandable_fields = {
+            "category": (ProductCategoryReadSerializer, {}),
+        }
+        field_dependencies = {"image_variants": ("image", "image_variants")}
+
+    def get_image_variants(self, obj):
+        request = self.context.get("request")
+        return get_variant_urls(obj.image.storage, obj.image_variants, request)
+
+
+class ProductFilterSerializer(serializers.Serializer):
+    """
+    Serializer class for validating product list filters
+    """
+
+    category = serializers.ListField(child=serializers.IntegerField(), required=False)
+    seller = serializers.IntegerField(required=False)
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    max_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    in_stock = serializers.BooleanField(allow_null=True, default=None)
+
+    def validate(self, validated_data):
+        min_price = validated_data.get("min_price")
+        max_price = validated_data.get("max_price")
+
+        if min_price is not None and max_price is not None and min_price > max_price:
+            error = {"min_price": _("Minimum price is more than the maximum price.")}
+            raise serializers.ValidationError(error)
+
+        return validated_data
+
+
+class ProductImportRowSerializer(serializers.Serializer):
+    """
+    Serializer class for validating a row of a product import file
+    """
+
+    name = serializers.CharField(max_length=200)
+    desc = serializers.CharField(allow_blank=True, default="")
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    quantity = serializers.IntegerField(min_value=0, default=1)
+    category = serializers.CharField(max_length=100, default="Others")
+
+
+class ProductImportSerializer(serializers.Serializer):
+    """
+    Serializer class for uploading a CSV or JSONL product import file
+    """
+
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=FORMATS, required=False)
+
+
+class ProductBulkUpdateSerializer(serializers.Serializer):
+    """
+    Serializer class for validating an entry of a bulk price and stock update
+    """
+
+    id = serializers.IntegerField()
+    price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    quantity = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, validated_data):
+        if "price" not in validated_data and "quantity" not in validated_data:
+            raise serializers.ValidationError(_("Provide a price or a quantity."))
+
+        return validated_data
+
+
+class ProductExportSerializer(serializers.Serializer):
+    """
+    Serializer class for validating catalog export options
+    """
+
+    file_format = serializers.ChoiceField(choices=FORMATS, default=CSV)
+    gzip = serializers.BooleanField(default=False)
 
 
 class ProductWriteSerializer(serializers.ModelSerializer):
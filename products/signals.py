@@ -0,0 +1,116 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from products import stock
+from products.cache import CATEGORIES, PRODUCTS, bump_version
+from products.counters import (
+    apply_count_deltas,
+    get_count_deltas,
+    refresh_category_counts,
+)
+from products.models import Product, ProductCategory
+from products.search import remove_from_search_index, update_search_index
+from products.tasks import IMAGE_FIELDS, generate_image_variants_task
+
+SEARCH_FIELDS = {"name", "desc"}
+
+
+@receiver(post_save, sender=Product)
+def update_product_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+
+    text = instance.get_indexed_text()
+    if text is not None and text == getattr(instance, "_indexed_text", None):
+        return
+
+    update_search_index([instance])
+    instance._indexed_text = text
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_search_index(sender, instance, **kwargs):
+    remove_from_search_index([instance.id])
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_cache(sender, **kwargs):
+    bump_version(PRODUCTS)
+
+
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+def invalidate_category_cache(sender, **kwargs):
+    # Products are serialized with their category name
+    bump_version(CATEGORIES, PRODUCTS)
+
+
+@receiver(post_save, sender=Product)
+def update_category_counts(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_counted_state", None)
+    current = instance.get_counted_state()
+
+    if created:
+        changes = [(*current, 1)]
+    elif previous is None or current is None:
+        # The previous state is unknown, recount the category from scratch
+        refresh_category_counts([instance.category_id])
+        bump_version(CATEGORIES)
+        instance.remember_counted_state()
+        return
+    else:
+        changes = [(*previous, -1), (*current, 1)]
+
+    deltas = get_count_deltas(changes)
+    if deltas:
+        apply_count_deltas(deltas)
+        bump_version(CATEGORIES)
+
+    instance.remember_counted_state()
+
+
+@receiver(post_delete, sender=Product)
+def decrease_category_counts(sender, instance, **kwargs):
+    state = getattr(instance, "_counted_state", None) or instance.get_counted_state()
+    if state is not None:
+        apply_count_deltas(get_count_deltas([(*state, -1)]))
+        bump_version(CATEGORIES)
+
+
+@receiver(post_delete, sender=ProductCategory)
+def recount_default_category(sender, instance, **kwargs):
+    # Products of a deleted category are moved to the default one in bulk
+    refresh_category_counts(
+        ProductCategory.objects.filter(name="Others").values_list("id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=ProductCategory)
+def generate_image_variants(sender, instance, **kwargs):
+    model_name = sender._meta.model_name
+    image_field, variants_field = IMAGE_FIELDS[model_name]
+    field_file = getattr(instance, image_field)
+    variants = getattr(instance, variants_field)
+
+    if not field_file:
+        if variants:
+            sender.objects.filter(pk=instance.pk).update(**{variants_field: {}})
+        return
+
+    if variants.get("source") != field_file.name:
+        transaction.on_commit(
+            lambda: generate_image_variants_task.delay(model_name, instance.pk)
+        )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def reset_hot_stock(sender, instance, **kwargs):
+    # Seed the Redis counter again from the saved stock, also when the product
+    # stopped being hot so its pending sales are written back
+    if stock.is_enabled() and (instance.is_hot or getattr(instance, "_was_hot", False)):
+        stock.reset([instance.id])
+    instance._was_hot = instance.is_hot
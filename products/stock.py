@@ -0,0 +1,275 @@
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, Sum, Value, When
+
+from products.cache import CATEGORIES, PRODUCTS, bump_version
+from products.counters import apply_count_deltas, get_count_deltas, get_stock_changes
+from products.models import Product
+
+DIRTY_KEY = "stock:dirty"
+LOCK_KEY = "stock:lock"
+
+# Create the counter of every product that doesn't have one yet. ARGV holds
+# the unheld stock in the database, from which the sales not reconciled yet
+# are subtracted.
+SEED_SCRIPT = """
+for i = 1, #KEYS, 2 do
+    if redis.call('exists', KEYS[i]) == 0 then
+        local sold = tonumber(redis.call('get', KEYS[i + 1]) or '0')
+        redis.call('set', KEYS[i], tonumber(ARGV[(i + 1) / 2]) - sold)
+    end
+end
+"""
+
+# Give back then take amounts from the counters in KEYS, all or nothing. ARGV
+# holds the amount given back and the amount taken of each counter, amounts
+# given back to counters that no longer exist are dropped. Returns the
+# position of the first counter falling short, or 0.
+RESERVE_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    local available = tonumber(redis.call('get', key) or '0') + tonumber(ARGV[2 * i - 1])
+    if available < tonumber(ARGV[2 * i]) then
+        return i
+    end
+end
+for i, key in ipairs(KEYS) do
+    if redis.call('exists', key) == 1 then
+        redis.call('incrby', key, tonumber(ARGV[2 * i - 1]) - tonumber(ARGV[2 * i]))
+    end
+end
+return 0
+"""
+
+# Give the amounts in ARGV back to the counters in KEYS that still exist
+RELEASE_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    if redis.call('exists', key) == 1 then
+        redis.call('incrby', key, ARGV[i])
+    end
+end
+"""
+
+# Sell stock. KEYS holds the available and sold counters of each product, then
+# the set of products with sales to reconcile. ARGV holds the product id, the
+# amount it had reserved and the amount sold of each product. Returns the ids
+# of the products falling short.
+COMMIT_SCRIPT = """
+local missing = {}
+for i = 1, #KEYS - 1, 2 do
+    local n = (i - 1) / 2 * 3
+    local id, reserved, sold = ARGV[n + 1], tonumber(ARGV[n + 2]), tonumber(ARGV[n + 3])
+    if reserved > 0 then
+        redis.call('incrby', KEYS[i], reserved)
+    end
+    if tonumber(redis.call('get', KEYS[i]) or '0') >= sold then
+        redis.call('decrby', KEYS[i], sold)
+        redis.call('incrby', KEYS[i + 1], sold)
+        redis.call('sadd', KEYS[#KEYS], id)
+    else
+        table.insert(missing, id)
+    end
+end
+return missing
+"""
+
+
+def is_enabled():
+    return settings.HOT_STOCK_ENABLED
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    return redis.Redis.from_url(settings.HOT_STOCK_REDIS_URL)
+
+
+@lru_cache(maxsize=None)
+def get_script(source):
+    return get_client().register_script(source)
+
+
+def available_key(product_id):
+    return f"stock:{product_id}:available"
+
+
+def sold_key(product_id):
+    return f"stock:{product_id}:sold"
+
+
+def get_hot_product_ids(product_ids):
+    """
+    Ids of the given products whose stock is kept in Redis
+    """
+    if not is_enabled():
+        return set()
+    return set(
+        Product.objects.filter(pk__in=product_ids, is_hot=True).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def seed_counters(product_ids):
+    """
+    Create the missing counters of the given products from the database
+    """
+    products = (
+        Product.objects.filter(pk__in=product_ids)
+        .order_by()
+        .annotate(
+            hot_reserved=Sum(
+                "stock_reservations__quantity",
+                filter=Q(stock_reservations__is_hot=True),
+            )
+        )
+        .values_list("id", "quantity", "reserved_quantity", "hot_reserved")
+    )
+    keys, args = [], []
+    for product_id, quantity, reserved, hot_reserved in products:
+        keys += [available_key(product_id), sold_key(product_id)]
+        args.append(quantity - reserved - (hot_reserved or 0))
+
+    if keys:
+        get_script(SEED_SCRIPT)(keys=keys, args=args)
+
+
+def get_available_quantities(product_ids):
+    """
+    Unheld stock of the given hot products, read with a single round trip
+    """
+    product_ids = list(product_ids)
+    seed_counters(product_ids)
+    values = get_client().mget([available_key(pk) for pk in product_ids])
+    return {pk: int(value or 0) for pk, value in zip(product_ids, values)}
+
+
+def reserve(quantities, released=None):
+    """
+    Hold stock of hot products, all or nothing. Returns the ids of the
+    products falling short.
+
+    The stock of a previous reservation in `released` is given back in the
+    same script, so it is never given back if the new reservation fails.
+    """
+    released = released or {}
+    seed_counters(quantities)
+
+    product_ids = sorted(quantities.keys() | released.keys())
+    args = []
+    for pk in product_ids:
+        args += [released.get(pk, 0), quantities.get(pk, 0)]
+
+    position = get_script(RESERVE_SCRIPT)(
+        keys=[available_key(pk) for pk in product_ids], args=args
+    )
+    return [product_ids[position - 1]] if position else []
+
+
+def release(quantities):
+    """
+    Give stock held for hot products back
+    """
+    if quantities:
+        get_script(RELEASE_SCRIPT)(
+            keys=[available_key(pk) for pk in quantities],
+            args=list(quantities.values()),
+        )
+
+
+def commit(reserved, quantities):
+    """
+    Sell stock of hot products, returns the ids of the products falling short.
+
+    The stock `reserved` for the sale is given back and the sold `quantities`
+    taken in the same script, so no other buyer can get it in between. Sales
+    only reach `Product.quantity` when they are reconciled.
+    """
+    product_ids = sorted(reserved.keys() | quantities.keys())
+    seed_counters(product_ids)
+
+    keys, args = [], []
+    for pk in product_ids:
+        keys += [available_key(pk), sold_key(pk)]
+        args += [pk, reserved.get(pk, 0), quantities.get(pk, 0)]
+    keys.append(DIRTY_KEY)
+
+    missing = get_script(COMMIT_SCRIPT)(keys=keys, args=args)
+    return [int(pk) for pk in missing]
+
+
+def flush_sales(product_ids):
+    """
+    Subtract the pending sales of the given products from `Product.quantity`
+    with one `UPDATE`.
+
+    The sold counters are only decreased once the update is committed, until
+    then seeding counts the sales twice, which can only hide stock.
+    """
+    product_ids = list(product_ids)
+    client = get_client()
+    sold = {
+        pk: int(value)
+        for pk, value in zip(
+            product_ids, client.mget([sold_key(pk) for pk in product_ids])
+        )
+        if value and int(value)
+    }
+    if not sold:
+        return 0
+
+    with transaction.atomic():
+        rows = (
+            Product.objects.select_for_update()
+            .filter(pk__in=sold)
+            .order_by("pk")
+            .values_list("id", "category_id", "quantity")
+        )
+        changes = get_stock_changes(
+            (category_id, quantity, quantity - sold[pk])
+            for pk, category_id, quantity in rows
+        )
+        Product.objects.filter(pk__in=sold).update(
+            quantity=F("quantity")
+            - Case(*(When(pk=pk, then=Value(n)) for pk, n in sold.items()))
+        )
+        apply_count_deltas(get_count_deltas(changes))
+
+    pipeline = client.pipeline()
+    for pk, n in sold.items():
+        pipeline.decrby(sold_key(pk), n)
+    pipeline.execute()
+
+    bump_version(PRODUCTS, CATEGORIES)
+    return len(sold)
+
+
+def reconcile(batch_size=None):
+    """
+    Write the sales of hot products back to the database in batches, returns
+    the number of products updated
+    """
+    batch_size = batch_size or settings.HOT_STOCK_RECONCILE_BATCH_SIZE
+    client = get_client()
+    updated = 0
+
+    with client.lock(LOCK_KEY, timeout=300):
+        while True:
+            product_ids = [int(pk) for pk in client.spop(DIRTY_KEY, batch_size)]
+            if not product_ids:
+                break
+            updated += flush_sales(product_ids)
+
+    return updated
+
+
+def reset(product_ids):
+    """
+    Reconcile the given products and drop their counters, so they are seeded
+    again from the database, e.g. after their stock was edited
+    """
+    client = get_client()
+    with client.lock(LOCK_KEY, timeout=300):
+        flush_sales(product_ids)
+        client.delete(*[available_key(pk) for pk in product_ids])
@@ -0,0 +1,46 @@
+from celery import shared_task
+from django.apps import apps
+
+from products import stock
+from products.cache import CATEGORIES, PRODUCTS, bump_version
+from products.images import generate_variants
+
+# Image field and the field holding its variants, per model
+IMAGE_FIELDS = {
+    "product": ("image", "image_variants"),
+    "productcategory": ("icon", "icon_variants"),
+}
+
+
+@shared_task()
+def generate_image_variants_task(model_name, pk):
+    """
+    Celery task to generate the resized variants of a product image or
+    category icon
+    """
+    model = apps.get_model("products", model_name)
+    image_field, variants_field = IMAGE_FIELDS[model_name]
+
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+
+    field_file = getattr(instance, image_field)
+    if not field_file:
+        return
+
+    variants = generate_variants(field_file)
+
+    # Skip the update if the image was replaced while we were working on it
+    model.objects.filter(pk=pk, **{image_field: field_file.name}).update(
+        **{variants_field: variants}
+    )
+    bump_version(CATEGORIES, PRODUCTS)
+
+
+@shared_task()
+def reconcile_hot_stock_task():
+    """
+    Celery task to write the sales of hot products back to the database
+    """
+    return stock.reconcile()
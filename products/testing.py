@@ -0,0 +1,34 @@
+from unittest import mock
+
+import fakeredis
+from django.test import TestCase, override_settings
+
+from products import stock
+
+
+@override_settings(HOT_STOCK_ENABLED=True)
+class HotStockTestCase(TestCase):
+    """
+    Keep the stock of hot products in an in-memory Redis, emptied before each
+    test so the counters are seeded again from the database
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.redis = fakeredis.FakeRedis()
+        patcher = mock.patch.object(stock, "get_client", return_value=cls.redis)
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        stock.get_script.cache_clear()
+        cls.addClassCleanup(stock.get_script.cache_clear)
+        super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        self.redis.flushall()
+
+    def get_available(self, product):
+        return stock.get_available_quantities([product.id])[product.id]
+
+    def get_sold(self, product):
+        return int(self.redis.get(stock.sold_key(product.id)) or 0)
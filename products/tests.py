@@ -0,0 +1,189 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from analytics.models import ProductCoPurchase
+from core.testing import LOCMEM_CACHES, QueryBudgetTestCase
+from orders.models import Order, StockReservation
+from products import stock
+from products.cache import PRODUCTS, bump_version, get_version
+from products.models import Product, ProductCategory
+from products.testing import HotStockTestCase
+from products.views import ProductCategoryViewSet, ProductViewSet
+
+User = get_user_model()
+
+
+class ProductQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        sellers = [
+            User.objects.create_user(username=f"seller{i}", email=f"s{i}@x.com")
+            for i in range(3)
+        ]
+        categories = [ProductCategory.objects.create(name=f"Cat {i}") for i in range(3)]
+        cls.products = [
+            Product.objects.create(
+                seller=sellers[i % 3],
+                category=categories[i % 3],
+                name=f"Product {i}",
+                price="10.00",
+                quantity=i,
+            )
+            for i in range(6)
+        ]
+        ProductCoPurchase.objects.bulk_create(
+            ProductCoPurchase(
+                product=cls.products[0], recommended=product, score=5 - rank, rank=rank
+            )
+            for rank, product in enumerate(cls.products[1:4])
+        )
+
+    def test_category_list(self):
+        self.assertQueryBudget(
+            ProductCategoryViewSet, "list", reverse("products:productcategory-list")
+        )
+
+    def test_category_retrieve(self):
+        category = ProductCategory.objects.first()
+        self.assertQueryBudget(
+            ProductCategoryViewSet,
+            "retrieve",
+            reverse("products:productcategory-detail", args=(category.id,)),
+        )
+
+    def test_product_list(self):
+        self.assertQueryBudget(ProductViewSet, "list", reverse("products:product-list"))
+
+    def test_product_list_expanded(self):
+        self.assertQueryBudget(
+            ProductViewSet,
+            "list",
+            reverse("products:product-list"),
+            {"expand": "category", "in_stock": "true"},
+        )
+
+    def test_product_retrieve(self):
+        self.assertQueryBudget(
+            ProductViewSet,
+            "retrieve",
+            reverse("products:product-detail", args=(self.products[0].id,)),
+        )
+
+    def test_product_recommendations(self):
+        self.assertQueryBudget(
+            ProductViewSet,
+            "recommendations",
+            reverse("products:product-recommendations", args=(self.products[0].id,)),
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheVersionTests(TestCase):
+    def test_bump_waits_for_commit(self):
+        version = get_version(PRODUCTS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_version(PRODUCTS)
+            self.assertEqual(get_version(PRODUCTS), version)
+
+        self.assertGreater(get_version(PRODUCTS), version)
+
+
+class HotStockTests(HotStockTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seller = User.objects.create_user(username="seller", email="s@x.com")
+        cls.buyer = User.objects.create_user(username="buyer", email="b@x.com")
+        cls.category = ProductCategory.objects.create(name="Books")
+        cls.product, cls.other = [
+            Product.objects.create(
+                seller=seller,
+                category=cls.category,
+                name=f"Book {quantity}",
+                price="5.00",
+                quantity=quantity,
+                is_hot=True,
+            )
+            for quantity in (5, 1)
+        ]
+
+    def test_seed_subtracts_held_stock(self):
+        Product.objects.filter(pk=self.product.pk).update(reserved_quantity=1)
+        StockReservation.objects.create(
+            order=Order.objects.create(buyer=self.buyer),
+            product=self.product,
+            quantity=2,
+            expires_at=timezone.now(),
+            is_hot=True,
+        )
+
+        self.assertEqual(self.get_available(self.product), 2)
+
+    def test_reserve_is_all_or_nothing(self):
+        missing = stock.reserve({self.product.id: 2, self.other.id: 2})
+
+        self.assertEqual(missing, [self.other.id])
+        self.assertEqual(self.get_available(self.product), 5)
+        self.assertEqual(self.get_available(self.other), 1)
+
+    def test_reserve_gives_released_stock_back(self):
+        stock.reserve({self.product.id: 3})
+        missing = stock.reserve({self.product.id: 4}, {self.product.id: 3})
+
+        self.assertEqual(missing, [])
+        self.assertEqual(self.get_available(self.product), 1)
+
+        missing = stock.reserve({self.product.id: 5}, {self.product.id: 4})
+        self.assertEqual(missing, [])
+        self.assertEqual(self.get_available(self.product), 0)
+
+    def test_reserve_falling_short_keeps_released_stock(self):
+        stock.reserve({self.product.id: 3})
+        missing = stock.reserve({self.product.id: 6}, {self.product.id: 3})
+
+        self.assertEqual(missing, [self.product.id])
+        self.assertEqual(self.get_available(self.product), 2)
+
+    def test_commit_sells_reserved_stock(self):
+        stock.reserve({self.product.id: 2})
+        missing = stock.commit({self.product.id: 2}, {self.product.id: 2})
+
+        self.assertEqual(missing, [])
+        self.assertEqual(self.get_available(self.product), 3)
+        self.assertEqual(self.get_sold(self.product), 2)
+        self.assertTrue(self.redis.sismember(stock.DIRTY_KEY, self.product.id))
+
+    def test_commit_falling_short(self):
+        missing = stock.commit({}, {self.other.id: 2})
+
+        self.assertEqual(missing, [self.other.id])
+        self.assertEqual(self.get_available(self.other), 1)
+        self.assertEqual(self.get_sold(self.other), 0)
+
+    def test_seed_subtracts_sales_not_reconciled(self):
+        stock.commit({}, {self.product.id: 2})
+        self.redis.delete(stock.available_key(self.product.id))
+
+        self.assertEqual(self.get_available(self.product), 3)
+
+    def test_reconcile_writes_sales_back(self):
+        stock.commit({}, {self.product.id: 5, self.other.id: 1})
+
+        self.assertEqual(stock.reconcile(batch_size=1), 2)
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 0)
+        self.assertEqual(self.get_sold(self.product), 0)
+        self.assertEqual(self.get_available(self.product), 0)
+        self.assertFalse(self.redis.exists(stock.DIRTY_KEY))
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.product_count, 2)
+        self.assertEqual(self.category.in_stock_count, 0)
+
+    def test_flush_sales_without_sales(self):
+        self.assertEqual(stock.flush_sales([self.product.id]), 0)
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 5)
@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from products import stock
+from products.cache import CATEGORIES, PRODUCTS, bump_version
+from products.counters import refresh_category_counts
+from products.models import Product
+
+BULK_UPDATE_FIELDS = ("price", "quantity", "updated_at")
+MAX_BULK_UPDATE_SIZE = 1000
+
+
+def bulk_update_products(changes, check_products=None):
+    """
+    Apply `{id: {"price": ..., "quantity": ...}}` changes to products in one
+    transaction.
+
+    The products are fetched and locked with a single query and handed to
+    `check_products`, which can raise to reject the whole batch. Caches are
+    invalidated once for the batch. Returns the number of updated products.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        products = list(
+            Product.objects.select_for_update()
+            .filter(pk__in=changes)
+            .order_by("pk")
+            .only("id", "seller_id", "category_id", "price", "quantity", "is_hot")
+        )
+        missing = changes.keys() - {product.id for product in products}
+        if missing:
+            error = _("Products %(ids)s do not exist.") % {"ids": sorted(missing)}
+            raise serializers.ValidationError({"id": error})
+
+        if check_products is not None:
+            check_products(products)
+
+        restocked = []
+        for product in products:
+            change = changes[product.id]
+            product.price = change.get("price", product.price)
+            if change.get("quantity", product.quantity) != product.quantity:
+                product.quantity = change["quantity"]
+                restocked.append(product)
+            product.updated_at = now
+
+        Product.objects.bulk_update(products, BULK_UPDATE_FIELDS, batch_size=500)
+        refresh_category_counts({product.category_id for product in restocked})
+
+    bump_version(PRODUCTS, CATEGORIES)
+
+    hot_ids = [product.id for product in restocked if product.is_hot]
+    if stock.is_enabled() and hot_ids:
+        stock.reset(hot_ids)
+
+    return len(products)
@@ -1,15 +1,51 @@
-from rest_framework import permissions, viewsets
+import codecs
 
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+
+from analytics.recommendations import get_recommended_products
+from core.mixins import QueryBudgetMixin, SparseFieldsetViewMixin
+from core.pagination import RankedPageNumberPagination
+from products.cache import (
+    CATEGORIES,
+    PRODUCTS,
+    RECOMMENDATIONS,
+    CachedReadMixin,
+    ConditionalGetMixin,
+    get_version,
+    make_key,
+)
+from products.exporters import CONTENT_TYPES, export_products
+from products.facets import get_product_facets
+from products.filters import ProductFilter, ProductSearchFilter
+from products.importers import guess_format, import_products, read_rows
 from products.models import Product, ProductCategory
 from products.permissions import IsSellerOrAdmin
 from products.serializers import (
+    ProductBulkUpdateSerializer,
     ProductCategoryReadSerializer,
+    ProductExportSerializer,
+    ProductImportSerializer,
     ProductReadSerializer,
     ProductWriteSerializer,
 )
+from products.updaters import MAX_BULK_UPDATE_SIZE, bulk_update_products
+
+MAX_REPORTED_IMPORT_ERRORS = 100
 
 
-class ProductCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductCategoryViewSet(
+    QueryBudgetMixin,
+    ConditionalGetMixin,
+    CachedReadMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     """
     List and Retrieve product categories
     """
@@ -17,25 +53,209 @@ class ProductCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = ProductCategory.objects.all()
     serializer_class = ProductCategoryReadSerializer
     permission_classes = (permissions.AllowAny,)
+    query_budget = {"list": 2, "retrieve": 2}
+    cache_resource = CATEGORIES
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(
+    QueryBudgetMixin,
+    ConditionalGetMixin,
+    CachedReadMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
     """
     CRUD products
+
+    Pass `?search=` to the list action to get products ranked by relevance.
+    Read actions accept `?fields=` and `?expand=category`.
+    Products can be filtered by `category`, `seller`, `min_price`, `max_price`
+    and `in_stock`, and the list comes with facet counts of the filtered products.
     """
 
     queryset = Product.objects.all()
+    filter_backends = (ProductFilter, ProductSearchFilter)
+    query_budget = {"list": 7, "retrieve": 2, "recommendations": 1}
+    cache_resource = PRODUCTS
+
+    @property
+    def paginator(self):
+        if self.action == "list" and ProductSearchFilter().get_search_query(
+            self.request
+        ):
+            self.pagination_class = RankedPageNumberPagination
+
+        return super().paginator
+
+    def get_queryset(self):
+        res = super().get_queryset()
+        return res.select_related("seller", "category").defer("search_vector")
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(self.list_cached, request, *args, **kwargs)
+
+    def list_cached(self, request, *args, **kwargs):
+        return self.get_cached_response(self.list_with_facets, request, *args, **kwargs)
+
+    def list_with_facets(self, request, *args, **kwargs):
+        """
+        List products with the facet counts, cached together with the page
+        """
+        response = mixins.ListModelMixin.list(self, request, *args, **kwargs)
+
+        filters = ProductFilter().get_filters(request)
+        filters["search"] = ProductSearchFilter().get_search_query(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        response.data["facets"] = get_product_facets(queryset, filters)
+
+        return response
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=(MultiPartParser,),
+    )
+    def bulk_import(self, request, *args, **kwargs):
+        """
+        Create products of the current user from an uploaded CSV or JSONL file
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upload = serializer.validated_data["file"]
+        file_format = serializer.validated_data.get("file_format") or guess_format(
+            upload.name
+        )
+        rows = read_rows(codecs.iterdecode(upload, "utf-8-sig"), file_format)
+
+        errors = []
+
+        def on_error(line_number, row_errors):
+            if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                errors.append({"line": line_number, "errors": row_errors})
+
+        try:
+            created = import_products(rows, request.user, on_error=on_error)
+        except UnicodeDecodeError:
+            error = {"file": _("The file is not UTF-8 encoded.")}
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"created": created, "errors": errors}, status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=True, methods=["get"])
+    def recommendations(self, request, *args, **kwargs):
+        """
+        Products frequently bought together with this one, best first
+        """
+        return self.get_cached_response(
+            self.list_recommendations, request, *args, **kwargs
+        )
+
+    def get_cache_key(self, request):
+        if self.action != "recommendations":
+            return super().get_cache_key(request)
+
+        # Recommendations are refreshed apart from the products they list
+        params = {
+            "path": request.path,
+            "query": sorted(request.query_params.lists()),
+            "products": get_version(PRODUCTS),
+        }
+        return make_key(RECOMMENDATIONS, self.action, params)
+
+    def list_recommendations(self, request, *args, **kwargs):
+        product_id = kwargs[self.lookup_field]
+        products = []
+        if product_id.isdigit():
+            products = list(get_recommended_products(product_id))
+        if not products:
+            # Tell an unknown product from one without recommendations
+            get_object_or_404(Product.objects.all(), pk=product_id)
+
+        serializer = self.get_serializer(products, many=True)
+
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["patch"], url_path="bulk")
+    def bulk_update(self, request, *args, **kwargs):
+        """
+        Update the price and/or quantity of many products of the current user
+        from a list of `{id, price, quantity}` entries
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        if len(serializer.validated_data) > MAX_BULK_UPDATE_SIZE:
+            error = _("Update at most %(max)d products at once.") % {
+                "max": MAX_BULK_UPDATE_SIZE
+            }
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes = {}
+        for entry in serializer.validated_data:
+            changes.setdefault(entry.pop("id"), {}).update(entry)
+
+        updated = bulk_update_products(
+            changes, lambda products: self.check_objects_permissions(request, products)
+        )
+
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+    def check_objects_permissions(self, request, objs):
+        """
+        Batch counterpart of `check_object_permissions`
+        """
+        for permission in self.get_permissions():
+            if not permission.has_objects_permission(request, self, objs):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, *args, **kwargs):
+        """
+        Stream the whole catalog as CSV or JSONL, optionally gzipped
+        """
+        serializer = ProductExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        file_format = serializer.validated_data["file_format"]
+        compress = serializer.validated_data["gzip"]
+
+        filename = f"products.{file_format}"
+        content_type = CONTENT_TYPES[file_format]
+        if compress:
+            filename += ".gz"
+            content_type = "application/gzip"
+
+        response = StreamingHttpResponse(
+            export_products(file_format, compress), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+        return response
 
     def get_serializer_class(self):
         if self.action in ("create", "update", "partial_update", "destroy"):
             return ProductWriteSerializer
+        elif self.action in ("bulk_import",):
+            return ProductImportSerializer
+        elif self.action in ("bulk_update",):
+            return ProductBulkUpdateSerializer
 
         return ProductReadSerializer
 
     def get_permissions(self):
-        if self.action in ("create",):
+        if self.action in ("create", "bulk_import"):
             self.permission_classes = (permissions.IsAuthenticated,)
-        elif self.action in ("update", "partial_update", "destroy"):
+        elif self.action in ("export",):
+            self.permission_classes = (permissions.IsAdminUser,)
+        elif self.action in ("update", "partial_update", "destroy", "bulk_update"):
             self.permission_classes = (IsSellerOrAdmin,)
         else:
             self.permission_classes = (permissions.AllowAny,)
@@ -0,0 +1,25 @@
+# Generated by Django 4.0.4 on 2026-10-18 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_alter_address_user'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='address',
+            options={'ordering': ('-created_at', '-id')},
+        ),
+        migrations.AlterModelOptions(
+            name='profile',
+            options={'ordering': ('-created_at',)},
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['-created_at', '-id'], name='address_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0005_created_at_id_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='address',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='address_user_created_idx'),
+        ),
+    ]
@@ -124,7 +124,13 @@ class Address(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ("-created_at",)
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(fields=("-created_at", "-id"), name="address_created_id_idx"),
+            models.Index(
+                fields=("user", "-created_at", "-id"), name="address_user_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.user.get_full_name()
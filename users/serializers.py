@@ -7,6 +7,8 @@ from phonenumber_field.serializerfields import PhoneNumberField
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from core.serializers import SparseFieldsetMixin
+
 from .exceptions import (
     AccountDisabledException,
     AccountNotRegisteredException,
@@ -190,7 +192,9 @@ class ProfileSerializer(serializers.ModelSerializer):
         )
 
 
-class AddressReadOnlySerializer(CountryFieldMixin, serializers.ModelSerializer):
+class AddressReadOnlySerializer(
+    SparseFieldsetMixin, CountryFieldMixin, serializers.ModelSerializer
+):
     """
     Serializer class to seralize Address model
     """
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from core.testing import QueryBudgetTestCase
+from users.models import Address
+from users.views import AddressViewSet
+
+User = get_user_model()
+
+
+class AddressQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", email="u@x.com")
+        cls.addresses = [
+            Address.objects.create(
+                user=cls.user,
+                address_type=address_type,
+                country="US",
+                city="City",
+                street_address="Street",
+                apartment_address="1",
+            )
+            for address_type in (Address.BILLING, Address.SHIPPING, Address.SHIPPING)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def test_address_list(self):
+        self.assertQueryBudget(AddressViewSet, "list", reverse("users:address-list"))
+
+    def test_address_retrieve(self):
+        self.assertQueryBudget(
+            AddressViewSet,
+            "retrieve",
+            reverse("users:address-detail", args=(self.addresses[0].id,)),
+        )
@@ -13,6 +13,7 @@ from rest_framework.generics import (
 from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
+from core.mixins import QueryBudgetMixin, SparseFieldsetViewMixin
 from users.models import Address, PhoneNumber, Profile
 from users.permissions import IsUserAddressOwner, IsUserProfileOwner
 from users.serializers import (
@@ -152,7 +153,7 @@ class UserAPIView(RetrieveAPIView):
         return self.request.user
 
 
-class AddressViewSet(ReadOnlyModelViewSet):
+class AddressViewSet(QueryBudgetMixin, SparseFieldsetViewMixin, ReadOnlyModelViewSet):
     """
     List and Retrieve user addresses
     """
@@ -160,8 +161,9 @@ class AddressViewSet(ReadOnlyModelViewSet):
     queryset = Address.objects.all()
     serializer_class = AddressReadOnlySerializer
     permission_classes = (IsUserAddressOwner,)
+    query_budget = {"list": 2, "retrieve": 2}
 
     def get_queryset(self):
         res = super().get_queryset()
         user = self.request.user
-        return res.filter(user=user)
+        return res.filter(user=user).select_related("user")